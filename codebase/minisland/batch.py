@@ -0,0 +1,77 @@
+from typing import List, Tuple
+from codebase.minisland.model import GameState, BoardTables, ScoringLogic
+import numpy as np
+
+_range_matrix_cache = dict()
+
+
+def _get_range_matrices(tables: BoardTables) -> List[Tuple[Tuple[ScoringLogic, np.ndarray, np.ndarray], ...]]:
+    """
+    Helper Method turning the compiled rules of BoardTables into matrices, cached per board size.
+    :return: Indexed by tile type index, a tuple of (rule, matching type indices, range matrix) where
+    range_matrix[j, i] counts in how many searchRange types of tile i the tile j falls, as get_score counts.
+    """
+    key = (tables.col_num, tables.row_num)
+    if key not in _range_matrix_cache:
+        range_matrices = list()
+        for compiled_rules in tables.rule_ranges:
+            lo_rules = list()
+            for rule, match_types, range_masks in compiled_rules:
+                range_matrix = np.zeros((tables.tile_count, tables.tile_count), dtype=np.int16)
+                for tile_idx in range(tables.tile_count):
+                    for range_mask in range_masks[tile_idx]:
+                        for other_idx in range(tables.tile_count):
+                            range_matrix[other_idx, tile_idx] += range_mask >> other_idx & 1
+                lo_rules.append((rule, np.array(match_types, dtype=np.int8), range_matrix))
+            range_matrices.append(tuple(lo_rules))
+        _range_matrix_cache[key] = range_matrices
+    return _range_matrix_cache[key]
+
+
+def get_batched_scores(types: np.ndarray) -> np.ndarray:
+    """
+    Scores N boards of the same size in one vectorized call, identically to Board.get_score.
+    param types: Array of shape (N, row_num, col_num) holding the index of each tile's type in KNOWN_TILE_TYPES.
+    :return: Array of the N scores.
+    """
+    board_num, row_num, col_num = types.shape
+    tables = BoardTables.get(col_num, row_num)
+    types = types.reshape((board_num, tables.tile_count))
+    scores = np.zeros(board_num, dtype=np.int64)
+    for type_idx, compiled_rules in enumerate(_get_range_matrices(tables)):
+        is_type = types == type_idx
+        if not compiled_rules or not is_type.any():
+            continue
+        for rule, match_types, range_matrix in compiled_rules:
+            match_counts = np.isin(types, match_types).astype(np.int16) @ range_matrix
+            if rule.is_repeat:
+                tile_scores = rule.base_score + match_counts * rule.unit_score
+            else:
+                tile_scores = np.where(match_counts > 0, rule.unit_score, rule.base_score)
+            scores += (tile_scores * is_type).sum(axis=1)
+    return scores
+
+
+def get_type_array(state: GameState) -> np.ndarray:
+    """
+    :return: The board of a state as an array of shape (row_num, col_num) of indices in KNOWN_TILE_TYPES.
+    """
+    tile_count = state.col_num * state.row_num
+    byte_count = (tile_count + 7) // 8
+    types = np.zeros(tile_count, dtype=np.int8)
+    for type_idx, mask in enumerate(state.board.get_board_key()):
+        if mask:
+            bits = np.unpackbits(np.frombuffer(mask.to_bytes(byte_count, "little"), dtype=np.uint8),
+                                 bitorder="little")[:tile_count]
+            types[bits.astype(bool)] = type_idx
+    return types.reshape((state.row_num, state.col_num))
+
+
+def get_frontier_scores(lo_states: List[GameState]) -> np.ndarray:
+    """
+    Scores a frontier of states of the same board size with a single batched call.
+    Usable as the batch_evaluation of beam_search_high_score.
+    """
+    if not lo_states:
+        return np.zeros(0, dtype=np.int64)
+    return get_batched_scores(np.stack([get_type_array(state) for state in lo_states]))
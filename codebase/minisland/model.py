@@ -51,6 +51,16 @@ class ScoringLogic:
                     return self.unit_score
         return self.base_score + counter * self.unit_score
 
+    def get_score_for_count(self, match_count: int) -> int:
+        """
+        Scores a tile given how many candidate tiles within its searchRange matched, as get_score would.
+        param match_count: Number of matching candidates, counted once per searchRange type they fall in.
+        :return: Returns the scoring of a single tile.
+        """
+        if match_count and not self.is_repeat:
+            return self.unit_score
+        return self.base_score + match_count * self.unit_score
+
 
 class TileType:
     """
@@ -79,6 +89,10 @@ class KnownTileType(Enum):
     TypeC = TileType("C", [ScoringLogic((lambda name: name == 'C'), -2, 0, [SearchRange.ADJ], False),
                            ScoringLogic((lambda name: name == "A" or name == "B"), 1, 0, [SearchRange.NEAR], False)])
 
+    def __reduce_ex__(self, protocol):
+        # Pickle members by name: their TileType values hold lambdas, which cannot be pickled.
+        return getattr, (KnownTileType, self.name)
+
     @classmethod
     def _missing_(cls, value):
         if isinstance(value, TileType):
@@ -105,6 +119,15 @@ class TileData:
         self.is_occupied = False
         self.type = KnownTileType.EMPTY
 
+    def clone(self) -> "TileData":
+        """
+        Copies the tile, sharing its immutable adjacency info.
+        """
+        tile = TileData(self.pos_x, self.pos_y, self.adj_info)
+        tile.is_occupied = self.is_occupied
+        tile.type = self.type
+        return tile
+
     def add_type(self, tar: KnownTileType):
         """
         Setter method for a tile data.
@@ -115,6 +138,13 @@ class TileData:
         self.type = tar
         self.is_occupied = True
 
+    def remove_type(self):
+        """
+        Setter method resetting a tile data to an unoccupied EMPTY tile.
+        """
+        self.type = KnownTileType.EMPTY
+        self.is_occupied = False
+
     def get_score(self, positions_to_tiles: Callable[[Tuple[List[Tuple[int, int]], List[Tuple[int, int]],
                                                             List[Tuple[int, int]], List[Tuple[int, int]]]],
                                                      Tuple[List[str], ...]]) -> int:
@@ -123,52 +153,96 @@ class TileData:
         adj, near, col, row = positions_to_tiles(self.adj_info)
         return self.type.value.get_score(adj, near, col, row)
 
+    def is_in_range(self, pos: Tuple[int, int]) -> bool:
+        """
+        Checks whether a position falls in the searchRange of any ScoringLogic of this tile's type.
+        param pos: A tuple of two ints representing the position (COORDINATES).
+        """
+        adj, near, col, row = self.adj_info
+        for rule in self.type.value.logic:
+            if SearchRange.NEAR in rule.search_range and (pos in adj or pos in near):
+                return True
+            if SearchRange.ADJ in rule.search_range and pos in adj:
+                return True
+            if SearchRange.COLUMN in rule.search_range and pos in col:
+                return True
+            if SearchRange.ROW in rule.search_range and pos in row:
+                return True
+        return False
+
+
+def generate_adjacency_info(pos: Tuple[int, int], col_num: int, row_num: int) -> \
+        Tuple[List[Tuple[int, int]], List[Tuple[int, int]], List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Generates the adjacent, near, same column and same row positions of a position on a board of size N x M.
+    param pos: A tuple of two ints representing the position (COORDINATES).
+    param col_num: Number of columns of the board.
+    param row_num: Number of rows of the board.
+    :return: A tuple of four lists of positions: adjacent, near (diagonal), column and row.
+    """
+    pos_x, pos_y = pos
+    adj, near, col, row = list(), list(), list(), list()
+    if pos_x < col_num - 1:
+        adj.append((pos_x + 1, pos_y))
+    if pos_x > 0:
+        adj.append((pos_x - 1, pos_y))
+    if pos_y < row_num - 1:
+        adj.append((pos_x, pos_y + 1))
+    if pos_y > 0:
+        adj.append((pos_x, pos_y - 1))
+    if pos_x < col_num - 1 and pos_y < row_num - 1:
+        near.append((pos_x + 1, pos_y + 1))
+    if pos_x < col_num - 1 and pos_y > 0:
+        near.append((pos_x + 1, pos_y - 1))
+    if pos_x > 0 and pos_y < row_num - 1:
+        near.append((pos_x - 1, pos_y + 1))
+    if pos_x > 0 and pos_y > 0:
+        near.append((pos_x - 1, pos_y - 1))
+    for r in range(row_num):
+        if r != pos_y:
+            col.append((pos_x, r))
+    for c in range(col_num):
+        if c != pos_x:
+            row.append((c, pos_y))
+    return adj, near, col, row
+
 
 class Board:
     """
     Board of Size N x M: generates tile position information
+    Keeps a running score updated by the delta of every placement; debug mode checks it against a full rescan.
     """
-    def __init__(self, col_num: int, row_num: int):
+    def __init__(self, col_num: int, row_num: int, debug: bool = False):
         self.col_num = col_num
         self.row_num = row_num
+        self.score = 0
+        self.debug = debug
         self.tile_map = dict()
-        for r in range(row_num):
-            for c in range(col_num):
-                adj_info = self._generate_adjacency_info((c, r))
-                self.tile_map[(c, r)] = TileData(c, r, adj_info)
-
-    def _generate_adjacency_info(self, pos: Tuple[int, int]) -> (Tuple[List[Tuple[int, int]], List[Tuple[int, int]],
-                                                                       List[Tuple[int, int]], List[Tuple[int, int]]]):
-        """
-        Helper Method for generating valid adjacency info.
-        param pos: A tuple of two ints representing the position from which to generate adjacency info.
-        :return: A tuple of two list of ints representing touching tiles and nearby tiles.
-        """
-        pos_x, pos_y = pos
-        adj, near, col, row = list(), list(), list(), list()
-        if pos_x < self.col_num - 1:
-            adj.append((pos_x + 1, pos_y))
-        if pos_x > 0:
-            adj.append((pos_x - 1, pos_y))
-        if pos_y < self.row_num - 1:
-            adj.append((pos_x, pos_y + 1))
-        if pos_y > 0:
-            adj.append((pos_x, pos_y - 1))
-        if pos_x < self.col_num - 1 and pos_y < self.row_num - 1:
-            near.append((pos_x + 1, pos_y + 1))
-        if pos_x < self.col_num - 1 and pos_y > 0:
-            near.append((pos_x + 1, pos_y - 1))
-        if pos_x > 0 and pos_y < self.row_num - 1:
-            near.append((pos_x - 1, pos_y + 1))
-        if pos_x > 0 and pos_y > 0:
-            near.append((pos_x - 1, pos_y - 1))
-        for r in range(self.row_num - 1):
-            if r != pos_y:
-                col.append((pos_x, r))
-        for c in range(self.col_num - 1):
-            if c != pos_x:
-                row.append((pos_y, c))
-        return adj, near, col, row
+        tables = BoardTables.get(col_num, row_num)
+        for (c, r), adj_info in zip(tables.positions, tables.adjacency_infos):
+            self.tile_map[(c, r)] = TileData(c, r, adj_info)
+
+    def clone(self) -> "Board":
+        """
+        Copies the board without regenerating adjacency info, which is shared between copies.
+        """
+        board = Board.__new__(Board)
+        board.col_num = self.col_num
+        board.row_num = self.row_num
+        board.score = self.score
+        board.debug = self.debug
+        board.tile_map = {pos: tile.clone() for pos, tile in self.tile_map.items()}
+        return board
+
+    def get_board_key(self) -> Tuple[int, ...]:
+        """
+        Canonical encoding of the board contents: one bitmask per tile type, as BitBoard keeps them.
+        """
+        tables, type_masks = BoardTables.get(self.col_num, self.row_num), [0] * len(KNOWN_TILE_TYPES)
+        for tile_pos, tile in self.tile_map.items():
+            if tile.is_occupied:
+                type_masks[KNOWN_TILE_TYPE_INDEX[tile.type]] |= 1 << tables.index_of(tile_pos)
+        return tuple(type_masks)
 
     def _get_tile_at_position(self, pos: Tuple[int, int]) -> TileData:
         """
@@ -210,11 +284,59 @@ class Board:
                 vacant_tiles.append(tile_pos)
         return vacant_tiles
 
-    def add_tile_type(self, tile_type: KnownTileType, pos: Tuple[int, int]) -> ():
+    def _get_tiles_in_range_of(self, pos: Tuple[int, int]) -> List[TileData]:
+        """
+        Helper Method for finding the occupied tiles whose score depends on the tile at a position.
+        param pos: A tuple of two ints representing the position (COORDINATES).
+        :return: A list of TileData whose ScoringLogic searchRange includes the position.
+        """
+        lo_tiles = list()
+        for lo_pos in self._get_tile_at_position(pos).adj_info:
+            for tile in self._get_tiles_at_positions(lo_pos):
+                if tile.is_occupied and tile not in lo_tiles and tile.is_in_range(pos):
+                    lo_tiles.append(tile)
+        return lo_tiles
+
+    def add_tile_type(self, tile_type: KnownTileType, pos: Tuple[int, int]) -> int:
+        """
+        Places a tile type and updates the running score, re-evaluating only the placed tile
+        and the tiles whose searchRange includes it.
+        :return: The change in score caused by the placement.
+        """
         tile = self._get_tile_at_position(pos)
         if tile.is_occupied:
             raise ValueError("Tile Has Been Occupied")
+        lo_affected = self._get_tiles_in_range_of(pos)
+        delta = 0
+        for other_tile in lo_affected:
+            delta -= other_tile.get_score(self._get_type_names_for_adjacency_info)
         tile.add_type(tile_type)
+        for other_tile in lo_affected + [tile]:
+            delta += other_tile.get_score(self._get_type_names_for_adjacency_info)
+        self.score += delta
+        if self.debug and self.score != self.get_score():
+            raise ValueError("Incremental Score Does Not Match Full Rescan")
+        return delta
+
+    def remove_tile_type(self, pos: Tuple[int, int]) -> int:
+        """
+        Undoes a placement and updates the running score.
+        :return: The change in score caused by the removal.
+        """
+        tile = self._get_tile_at_position(pos)
+        if not tile.is_occupied:
+            raise ValueError("Tile Has Not Been Occupied")
+        lo_affected = self._get_tiles_in_range_of(pos)
+        delta = 0
+        for other_tile in lo_affected + [tile]:
+            delta -= other_tile.get_score(self._get_type_names_for_adjacency_info)
+        tile.remove_type()
+        for other_tile in lo_affected:
+            delta += other_tile.get_score(self._get_type_names_for_adjacency_info)
+        self.score += delta
+        if self.debug and self.score != self.get_score():
+            raise ValueError("Incremental Score Does Not Match Full Rescan")
+        return delta
 
     def get_score(self):
         score = 0
@@ -232,13 +354,291 @@ class Board:
             print(row_str + "\n")
 
 
+KNOWN_TILE_TYPES = list(KnownTileType)
+KNOWN_TILE_TYPE_INDEX = {tile_type: idx for idx, tile_type in enumerate(KNOWN_TILE_TYPES)}
+EMPTY_TYPE_INDEX = KNOWN_TILE_TYPE_INDEX[KnownTileType.EMPTY]
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class BoardTables:
+    """
+    Immutable bitmask tables of a board of size N x M. Bit (r * N + c) represents the tile at (c, r).
+    Tables are cached per board size and shared by every BitBoard of that size.
+    """
+    _cache = dict()
+
+    def __init__(self, col_num: int, row_num: int):
+        self.col_num = col_num
+        self.row_num = row_num
+        self.tile_count = col_num * row_num
+        self.full_mask = (1 << self.tile_count) - 1
+        self.positions = tuple((c, r) for r in range(row_num) for c in range(col_num))
+        self.adjacency_infos = tuple(tuple(tuple(lo_pos) for lo_pos in generate_adjacency_info(pos, col_num, row_num))
+                                     for pos in self.positions)
+        adj_masks, near_masks, col_masks, row_masks = [], [], [], []
+        for adj, near, col, row in self.adjacency_infos:
+            adj_masks.append(self.positions_to_mask(adj))
+            near_masks.append(self.positions_to_mask(near))
+            col_masks.append(self.positions_to_mask(col))
+            row_masks.append(self.positions_to_mask(row))
+        self.adj_masks = tuple(adj_masks)
+        self.near_masks = tuple(near_masks)
+        self.col_masks = tuple(col_masks)
+        self.row_masks = tuple(row_masks)
+        self.rule_ranges = self._generate_rule_ranges()
+        self.reach_masks = self._generate_reach_masks()
+
+    @classmethod
+    def get(cls, col_num: int, row_num: int) -> "BoardTables":
+        """
+        Getter method for the shared tables of a board size, generating them on first use.
+        """
+        key = (col_num, row_num)
+        if key not in cls._cache:
+            cls._cache[key] = BoardTables(col_num, row_num)
+        return cls._cache[key]
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return BoardTables.get, (self.col_num, self.row_num)
+
+    def index_of(self, pos: Tuple[int, int]) -> int:
+        x, y = pos
+        if x < 0 or y < 0 or x >= self.col_num or y >= self.row_num:
+            raise ValueError("Position Outside Board Dimensions")
+        return y * self.col_num + x
+
+    def positions_to_mask(self, lo_pos: List[Tuple[int, int]]) -> int:
+        mask = 0
+        for pos in lo_pos:
+            mask |= 1 << self.index_of(pos)
+        return mask
+
+    def _generate_rule_ranges(self) -> List[Tuple[Tuple[ScoringLogic, Tuple[int, ...], Tuple[Tuple[int, ...], ...]],
+                                                  ...]]:
+        """
+        Helper Method compiling the ScoringLogic of every KnownTileType against the board.
+        :return: Indexed by tile type index, a tuple of (rule, matching type indices, range masks per tile index).
+        Range masks are kept per searchRange type so that a candidate falling in several ranges is counted
+        once per range, exactly as ScoringLogic.get_score does.
+        """
+        rule_ranges = list()
+        for tile_type in KNOWN_TILE_TYPES:
+            compiled_rules = list()
+            for rule in tile_type.value.logic:
+                match_types = tuple(idx for idx, other in enumerate(KNOWN_TILE_TYPES)
+                                    if rule.match_logic(other.value.name))
+                lo_range_masks = list()
+                if SearchRange.NEAR in rule.search_range:
+                    lo_range_masks.append(tuple(a | n for a, n in zip(self.adj_masks, self.near_masks)))
+                elif SearchRange.ADJ in rule.search_range:
+                    lo_range_masks.append(self.adj_masks)
+                if SearchRange.COLUMN in rule.search_range:
+                    lo_range_masks.append(self.col_masks)
+                if SearchRange.ROW in rule.search_range:
+                    lo_range_masks.append(self.row_masks)
+                range_masks = tuple(zip(*lo_range_masks)) if lo_range_masks else ((),) * self.tile_count
+                compiled_rules.append((rule, match_types, range_masks))
+            rule_ranges.append(tuple(compiled_rules))
+        return rule_ranges
+
+    def _generate_reach_masks(self) -> List[Tuple[int, ...]]:
+        """
+        Helper Method for the union of every searchRange of a tile type at each tile index.
+        As the ranges are symmetric, it also holds every tile of that type whose score depends on the tile index.
+        """
+        reach_masks = list()
+        for compiled_rules in self.rule_ranges:
+            lo_reach = [0] * self.tile_count
+            for rule, match_types, range_masks in compiled_rules:
+                for tile_idx in range(self.tile_count):
+                    for range_mask in range_masks[tile_idx]:
+                        lo_reach[tile_idx] |= range_mask
+            reach_masks.append(tuple(lo_reach))
+        return reach_masks
+
+
+class BitBoard:
+    """
+    Board of Size N x M encoding every tile type as an integer bitmask over the grid.
+    Scores identically to Board, while occupancy and searchRange checks become bitwise operations.
+    """
+    __slots__ = ("col_num", "row_num", "tables", "type_masks", "occupied", "score", "debug")
+
+    def __init__(self, col_num: int, row_num: int, debug: bool = False):
+        self.col_num = col_num
+        self.row_num = row_num
+        self.tables = BoardTables.get(col_num, row_num)
+        self.type_masks = [0] * len(KNOWN_TILE_TYPES)
+        self.occupied = 0
+        self.score = 0
+        self.debug = debug
+
+    def clone(self) -> "BitBoard":
+        """
+        Copies the board: a handful of ints, sharing the immutable tables.
+        """
+        board = BitBoard.__new__(BitBoard)
+        board.col_num = self.col_num
+        board.row_num = self.row_num
+        board.tables = self.tables
+        board.type_masks = self.type_masks.copy()
+        board.occupied = self.occupied
+        board.score = self.score
+        board.debug = self.debug
+        return board
+
+    def get_board_key(self) -> Tuple[int, ...]:
+        """
+        Canonical encoding of the board contents: one bitmask per tile type.
+        """
+        return tuple(self.type_masks)
+
+    def _get_match_mask(self, match_types: Tuple[int, ...]) -> int:
+        mask = 0
+        for type_idx in match_types:
+            if type_idx == EMPTY_TYPE_INDEX:
+                mask |= self.tables.full_mask & ~self.occupied
+            else:
+                mask |= self.type_masks[type_idx]
+        return mask
+
+    def _get_tile_score(self, type_idx: int, tile_idx: int) -> int:
+        score = 0
+        for rule, match_types, range_masks in self.tables.rule_ranges[type_idx]:
+            match_mask, match_count = self._get_match_mask(match_types), 0
+            for range_mask in range_masks[tile_idx]:
+                match_count += _popcount(range_mask & match_mask)
+            score += rule.get_score_for_count(match_count)
+        return score
+
+    def _get_tiles_in_range_of(self, tile_idx: int) -> List[Tuple[int, int]]:
+        """
+        Helper Method for finding the occupied tiles whose score depends on the tile at a tile index.
+        :return: A list of (type index, tile index) whose ScoringLogic searchRange includes the tile index.
+        """
+        lo_tiles = list()
+        for type_idx, reach_masks in enumerate(self.tables.reach_masks):
+            tiles = self.type_masks[type_idx] & reach_masks[tile_idx]
+            while tiles:
+                low_bit = tiles & -tiles
+                tiles ^= low_bit
+                lo_tiles.append((type_idx, low_bit.bit_length() - 1))
+        return lo_tiles
+
+    def get_tile_type_at_position(self, pos: Tuple[int, int]) -> KnownTileType:
+        bit = 1 << self.tables.index_of(pos)
+        for type_idx, mask in enumerate(self.type_masks):
+            if mask & bit:
+                return KNOWN_TILE_TYPES[type_idx]
+        return KnownTileType.EMPTY
+
+    def get_vacant_tile_positions(self) -> List[Tuple[int, int]]:
+        vacant = self.tables.full_mask & ~self.occupied
+        return [pos for idx, pos in enumerate(self.tables.positions) if vacant >> idx & 1]
+
+    def add_tile_type(self, tile_type: KnownTileType, pos: Tuple[int, int]) -> int:
+        """
+        Places a tile type and updates the running score, re-evaluating only the placed tile
+        and the tiles whose searchRange includes it.
+        :return: The change in score caused by the placement.
+        """
+        tile_idx = self.tables.index_of(pos)
+        bit = 1 << tile_idx
+        if self.occupied & bit:
+            raise ValueError("Tile Has Been Occupied")
+        if tile_type == KnownTileType.EMPTY:
+            raise ValueError("Placing Empty TileData Type")
+        type_idx = KNOWN_TILE_TYPE_INDEX[tile_type]
+        lo_affected = self._get_tiles_in_range_of(tile_idx)
+        delta = 0
+        for other_type_idx, other_tile_idx in lo_affected:
+            delta -= self._get_tile_score(other_type_idx, other_tile_idx)
+        self.type_masks[type_idx] |= bit
+        self.occupied |= bit
+        for other_type_idx, other_tile_idx in lo_affected:
+            delta += self._get_tile_score(other_type_idx, other_tile_idx)
+        delta += self._get_tile_score(type_idx, tile_idx)
+        self.score += delta
+        if self.debug and self.score != self.get_score():
+            raise ValueError("Incremental Score Does Not Match Full Rescan")
+        return delta
+
+    def remove_tile_type(self, pos: Tuple[int, int]) -> int:
+        """
+        Undoes a placement and updates the running score.
+        :return: The change in score caused by the removal.
+        """
+        tile_idx = self.tables.index_of(pos)
+        bit = 1 << tile_idx
+        if not self.occupied & bit:
+            raise ValueError("Tile Has Not Been Occupied")
+        type_idx = KNOWN_TILE_TYPE_INDEX[self.get_tile_type_at_position(pos)]
+        lo_affected = self._get_tiles_in_range_of(tile_idx)
+        delta = -self._get_tile_score(type_idx, tile_idx)
+        for other_type_idx, other_tile_idx in lo_affected:
+            delta -= self._get_tile_score(other_type_idx, other_tile_idx)
+        self.type_masks[type_idx] &= ~bit
+        self.occupied &= ~bit
+        for other_type_idx, other_tile_idx in lo_affected:
+            delta += self._get_tile_score(other_type_idx, other_tile_idx)
+        self.score += delta
+        if self.debug and self.score != self.get_score():
+            raise ValueError("Incremental Score Does Not Match Full Rescan")
+        return delta
+
+    def get_score(self):
+        score = 0
+        for type_idx, compiled_rules in enumerate(self.tables.rule_ranges):
+            tiles = self.type_masks[type_idx]
+            if not tiles or not compiled_rules:
+                continue
+            lo_rules = [(rule, self._get_match_mask(match_types), range_masks)
+                        for rule, match_types, range_masks in compiled_rules]
+            while tiles:
+                low_bit = tiles & -tiles
+                tile_idx = low_bit.bit_length() - 1
+                tiles ^= low_bit
+                for rule, match_mask, range_masks in lo_rules:
+                    match_count = 0
+                    for range_mask in range_masks[tile_idx]:
+                        match_count += _popcount(range_mask & match_mask)
+                    score += rule.get_score_for_count(match_count)
+        return score
+
+    def view_board_cli(self):
+        for r in range(self.row_num):
+            row_str = ""
+            for c in range(self.col_num):
+                row_str += "   " + self.get_tile_type_at_position((c, r)).value.name
+            print(row_str + "\n")
+
+
+class BoardEngine(Enum):
+    """
+    Board representations a GameState can be played on. Both engines score identically.
+    """
+    DICT = Board
+    BITBOARD = BitBoard
+
+
 class GameState:
-    def __init__(self, col_num: int, row_num: int, turn_limit: int, choice_count: int, seed_num: int):
+    """
+    A seeded game. States hash and compare by turn index and board contents, so equal boards reached
+    by different move orders are merged when used as keys. Do not mutate a state while it is used as a key.
+    """
+    def __init__(self, col_num: int, row_num: int, turn_limit: int, choice_count: int, seed_num: int,
+                 board_engine: BoardEngine = BoardEngine.DICT, debug: bool = False):
         if col_num * row_num / choice_count < turn_limit:
             raise ValueError("More Turns than Tiles")
         self.col_num = col_num
         self.row_num = row_num
-        self.board = Board(col_num, row_num)
+        self.board = board_engine.value(col_num, row_num, debug)
         self.turns_passed = 0
         self.turn_limit = turn_limit
         self.choice_count = choice_count
@@ -268,10 +668,34 @@ class GameState:
         return lo_choices
 
     def _execute_turn(self, choice_option: Tuple[Any, Tuple[int, int]]):
-        self.board.add_tile_type(choice_option[0], choice_option[1])
-        self.score = self.board.get_score()
+        self.score += self.board.add_tile_type(choice_option[0], choice_option[1])
         self.turns_passed += 1
 
+    def clone(self) -> "GameState":
+        """
+        Copies the state for search. The seeded choices are immutable and shared between copies.
+        """
+        state = GameState.__new__(GameState)
+        state.col_num = self.col_num
+        state.row_num = self.row_num
+        state.board = self.board.clone()
+        state.turns_passed = self.turns_passed
+        state.turn_limit = self.turn_limit
+        state.choice_count = self.choice_count
+        state.choices = self.choices
+        state.score = self.score
+        return state
+
+    def __hash__(self):
+        return hash((self.turns_passed, self.board.get_board_key()))
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.turns_passed == other.turns_passed and \
+            (self.choices is other.choices or self.choices == other.choices) and \
+            self.board.get_board_key() == other.board.get_board_key()
+
     def get_choices(self) -> Tuple[Tuple[KnownTileType, Tuple[int, int]], ...]:
         return self.choices[self.turns_passed]
 
@@ -286,6 +710,18 @@ class GameState:
         turn_option = self.get_choices()[option]
         self._execute_turn(turn_option)
 
+    def undo_option(self, option: int):
+        """
+        Method to revert the option chosen on the previous turn, the inverse of choose_option.
+        """
+        if self.turns_passed <= 0:
+            raise ValueError("No Turn To Undo")
+        if option < 0 or option >= self.choice_count:
+            raise ValueError("Invalid Option Given")
+        self.turns_passed -= 1
+        turn_option = self.get_choices()[option]
+        self.score += self.board.remove_tile_type(turn_option[1])
+
     def has_game_ended(self) -> bool:
         # TODO: Checking of complete board?
         return self.turns_passed >= self.turn_limit
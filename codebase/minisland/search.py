@@ -1,31 +1,120 @@
-from typing import List, Tuple, Dict
-from codebase.minisland.model import GameState
-import copy
+from typing import List, Tuple, Optional, Iterator, Callable, Iterable, Dict, Sequence
+from enum import Enum
+from codebase.minisland.model import GameState, BoardEngine, BoardTables, KNOWN_TILE_TYPES, KNOWN_TILE_TYPE_INDEX, \
+    EMPTY_TYPE_INDEX
+import heapq
+import math
+import multiprocessing
 import time
 
 
-def bfs_high_score(init_state: GameState) -> Tuple[int, List[int]]:
+class EvictionPolicy(Enum):
+    """
+    Which entry a full TranspositionTable drops to make room for a new one.
+    """
+    LOWEST_SCORE = "lowest_score"
+    OLDEST = "oldest"
+
+
+class TranspositionTable:
+    """
+    Maps a GAMESTATE to the path of CHOICES reaching it. States hash by board contents plus turn index,
+    so a board reached by different move orders is stored once. Equal boards score equally,
+    hence the first path stored, which is the first found, is kept as the best one.
+    With a max_size the table holds at most that many states, evicting by the given policy.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, eviction_policy: EvictionPolicy = EvictionPolicy.LOWEST_SCORE):
+        if max_size is not None and max_size < 1:
+            raise ValueError("Invalid Table Size Given")
+        self.max_size = max_size
+        self.eviction_policy = eviction_policy
+        self.table = dict()
+        self._stamps = dict()
+        self._heap = []
+        self._counter = 0
+        self.merged_count = 0
+        self.evicted_count = 0
+
+    def store(self, state: GameState, path: List[int]) -> bool:
+        """
+        Stores the path reaching a state unless an equivalent state has been stored already.
+        :return: Whether the state is in the table afterwards.
+        """
+        if state in self.table:
+            self.merged_count += 1
+            return True
+        self.table[state] = path
+        if self.max_size is not None and self.eviction_policy == EvictionPolicy.LOWEST_SCORE:
+            self._counter += 1
+            self._stamps[state] = self._counter
+            heapq.heappush(self._heap, (state.score, self._counter, state))
+        if self.max_size is not None and len(self.table) > self.max_size:
+            return self._evict() is not state
+        return True
+
+    def _evict(self) -> GameState:
+        if self.eviction_policy == EvictionPolicy.LOWEST_SCORE:
+            while True:
+                score, stamp, state = heapq.heappop(self._heap)
+                if self._stamps.get(state) == stamp:
+                    break
+        else:
+            state = next(iter(self.table))
+        self.pop(state)
+        self.evicted_count += 1
+        return state
+
+    def pop(self, state: GameState) -> List[int]:
+        """
+        Removes a state. Its heap entry goes stale, and the heap is compacted once stale entries outnumber live ones,
+        so popped states are not kept alive by it.
+        """
+        if self._stamps.pop(state, None) is not None and len(self._heap) > 2 * len(self._stamps):
+            self._heap = [entry for entry in self._heap if self._stamps.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+        return self.table.pop(state)
+
+    def keys(self):
+        return self.table.keys()
+
+    def __getitem__(self, state: GameState) -> List[int]:
+        return self.table[state]
+
+    def __contains__(self, state: GameState) -> bool:
+        return state in self.table
+
+    def __iter__(self) -> Iterator[GameState]:
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+
+def bfs_high_score(init_state: GameState, table_size: Optional[int] = None,
+                   eviction_policy: EvictionPolicy = EvictionPolicy.LOWEST_SCORE) -> Tuple[int, List[int]]:
     """
     memo: Represents the path taken by mapping a GAMESTATE to CHOICE taken.
     A choice represents the placement of a Tile type on the board.
 
     Navigates every option at every state as a breadth first search.
     Accumulates the path with highest return of scoring.
+    Each turn's frontier is a TranspositionTable of at most table_size states, merging equal boards.
 
     """
 
-    memo = dict()
-    memo[init_state] = []
+    memo = TranspositionTable()
+    memo.store(init_state, [])
     for i in range(init_state.turn_limit):
-        lo_new_states = dict()
+        lo_new_states = TranspositionTable(table_size, eviction_policy)
         for state_on_turn in memo:
             path = memo[state_on_turn]
             for n in range(init_state.choice_count):
-                state_n = copy.deepcopy(state_on_turn)
+                state_n = state_on_turn.clone()
                 state_n.choose_option(n)
                 path_n = path.copy()
                 path_n.append(n)
-                lo_new_states[state_n] = path_n
+                lo_new_states.store(state_n, path_n)
         memo = lo_new_states
     max_score = 0
     for state_on_turn in memo:
@@ -37,25 +126,27 @@ def bfs_high_score(init_state: GameState) -> Tuple[int, List[int]]:
     return max_score, []
 
 
-def bfs_high_score_with_pruning(init_state: GameState) -> Tuple[int, List[int]]:
+def bfs_high_score_with_pruning(init_state: GameState, table_size: Optional[int] = None,
+                                eviction_policy: EvictionPolicy = EvictionPolicy.LOWEST_SCORE) \
+        -> Tuple[int, List[int]]:
     """
     Extra step that evaluates the score of a choice to prune irrelevant nodes.
     """
-    memo = dict()
-    memo[init_state] = []
+    memo = TranspositionTable()
+    memo.store(init_state, [])
     for i in range(init_state.turn_limit):
-        lo_new_states = dict()
+        lo_new_states = TranspositionTable(table_size, eviction_policy)
         for state_on_turn in memo:
             state_score = state_on_turn.score
             path = memo[state_on_turn]
             for n in range(init_state.choice_count):
-                state_n = copy.deepcopy(state_on_turn)
+                state_n = state_on_turn.clone()
                 state_n.choose_option(n)
                 if state_n.score < 0 or state_n.score < state_score:
                     continue
                 path_n = path.copy()
                 path_n.append(n)
-                lo_new_states[state_n] = path_n
+                lo_new_states.store(state_n, path_n)
         memo = lo_new_states
     max_score = 0
     for state_on_turn in memo:
@@ -68,23 +159,26 @@ def bfs_high_score_with_pruning(init_state: GameState) -> Tuple[int, List[int]]:
 
 
 # Depth Limited BFS search which prunes a percentage of the nodes after maxing the depth counter
-def depth_limited_bfs_high_score(init_state: GameState, depth: int, pct_to_prune: float) -> Tuple[int, List[int]]:
-    memo = dict()
-    memo[init_state] = []
+def depth_limited_bfs_high_score(init_state: GameState, depth: int, pct_to_prune: float,
+                                 table_size: Optional[int] = None,
+                                 eviction_policy: EvictionPolicy = EvictionPolicy.LOWEST_SCORE) \
+        -> Tuple[int, List[int]]:
+    memo = TranspositionTable()
+    memo.store(init_state, [])
     counter = 0
     for i in range(init_state.turn_limit):
-        lo_new_states = dict()
+        lo_new_states = TranspositionTable(table_size, eviction_policy)
         for state_on_turn in memo:
             state_score = state_on_turn.score
             path = memo[state_on_turn]
             for n in range(init_state.choice_count):
-                state_n = copy.deepcopy(state_on_turn)
+                state_n = state_on_turn.clone()
                 state_n.choose_option(n)
                 if state_n.score < 0 or state_n.score < state_score:
                     continue
                 path_n = path.copy()
                 path_n.append(n)
-                lo_new_states[state_n] = path_n
+                lo_new_states.store(state_n, path_n)
         memo = lo_new_states
         if counter == depth:
             prune_percentage(memo, pct_to_prune)
@@ -101,7 +195,300 @@ def depth_limited_bfs_high_score(init_state: GameState, depth: int, pct_to_prune
     return max_score, []
 
 
-def prune_percentage(memo: Dict[GameState, List[int]], pct: float):
+class ScoreBound:
+    """
+    Admissible upper bound on the final score reachable from a state of a seeded game.
+    A tile's final match count for a ScoringLogic lies between the matches already on the board and those
+    plus every matching tile the remaining choices still offer, so the best count in that interval bounds its
+    final score. Summing this over the placed tiles and the best choice of every remaining turn bounds the game.
+    """
+
+    def __init__(self, init_state: GameState):
+        self.tables = BoardTables.get(init_state.col_num, init_state.row_num)
+        self.turn_limit = init_state.turn_limit
+        self.choices = [tuple((KNOWN_TILE_TYPE_INDEX[tile_type], self.tables.index_of(pos))
+                              for tile_type, pos in turn_choices) for turn_choices in init_state.choices]
+        self.future_masks = [(0,) * len(KNOWN_TILE_TYPES)] * (self.turn_limit + 1)
+        for turn_num in reversed(range(self.turn_limit)):
+            masks = list(self.future_masks[turn_num + 1])
+            for type_idx, tile_idx in self.choices[turn_num]:
+                masks[type_idx] |= 1 << tile_idx
+            self.future_masks[turn_num] = tuple(masks)
+
+    def _get_tile_bound(self, type_idx: int, tile_idx: int, board_masks: Tuple[int, ...], occupied: int,
+                        future_masks: Tuple[int, ...]) -> int:
+        """
+        Helper Method bounding the final score of a tile, placed or offered, from above.
+        """
+        bound, other_tiles = 0, ~(1 << tile_idx)
+        for rule, match_types, range_masks in self.tables.rule_ranges[type_idx]:
+            placed_mask, offered_mask = 0, 0
+            for match_type in match_types:
+                if match_type == EMPTY_TYPE_INDEX:
+                    offered_mask |= self.tables.full_mask & ~occupied
+                else:
+                    placed_mask |= board_masks[match_type]
+                    offered_mask |= future_masks[match_type]
+            offered_mask &= other_tiles & ~placed_mask
+            placed_count, offered_count = 0, 0
+            for range_mask in range_masks[tile_idx]:
+                placed_count += bin(range_mask & placed_mask).count("1")
+                offered_count += bin(range_mask & offered_mask).count("1")
+            if rule.is_repeat:
+                bound += max(rule.get_score_for_count(placed_count),
+                             rule.get_score_for_count(placed_count + offered_count))
+            elif placed_count or not offered_count:
+                bound += rule.get_score_for_count(placed_count)
+            else:
+                bound += max(rule.get_score_for_count(0), rule.get_score_for_count(offered_count))
+        return bound
+
+    def get_upper_bound(self, state: GameState) -> int:
+        board_masks = state.board.get_board_key()
+        occupied = 0
+        for mask in board_masks:
+            occupied |= mask
+        future_masks = self.future_masks[state.turns_passed]
+        bound = 0
+        for type_idx, tiles in enumerate(board_masks):
+            while tiles:
+                low_bit = tiles & -tiles
+                tiles ^= low_bit
+                bound += self._get_tile_bound(type_idx, low_bit.bit_length() - 1, board_masks, occupied, future_masks)
+        for turn_num in range(state.turns_passed, self.turn_limit):
+            bound += max(self._get_tile_bound(type_idx, tile_idx, board_masks, occupied, future_masks)
+                         for type_idx, tile_idx in self.choices[turn_num])
+        return bound
+
+
+class BranchAndBoundSolver:
+    """
+    Depth first branch and bound over a seeded game, undoing moves instead of copying states.
+    Children are visited best bound first, and a subtree is cut once its ScoreBound cannot beat the best
+    complete game found so far, so the result is provably optimal.
+    """
+
+    def __init__(self, init_state: GameState):
+        self.state = init_state.clone()
+        self.score_bound = ScoreBound(init_state)
+        self.best_score = None
+        self.best_path = []
+        self.nodes_expanded = 0
+
+    def _is_cut(self, bound: int) -> bool:
+        return self.best_score is not None and bound <= self.best_score
+
+    def _publish_best(self):
+        """
+        Hook called whenever a better complete game is found.
+        """
+        pass
+
+    def _get_ordered_children(self) -> List[Tuple[int, int]]:
+        """
+        :return: The (bound, choice) pairs of the current state, best bound first and ties by choice.
+        """
+        state, lo_children = self.state, []
+        for n in range(state.choice_count):
+            state.choose_option(n)
+            lo_children.append((self.score_bound.get_upper_bound(state), n))
+            state.undo_option(n)
+        lo_children.sort(key=lambda child: child[0], reverse=True)
+        return lo_children
+
+    def _search(self, path: List[int]):
+        self.nodes_expanded += 1
+        state = self.state
+        if state.has_game_ended():
+            if self.best_score is None or state.score > self.best_score:
+                self.best_score = state.score
+                self.best_path = path.copy()
+                self._publish_best()
+            return
+        for bound, n in self._get_ordered_children():
+            if self._is_cut(bound):
+                break
+            state.choose_option(n)
+            path.append(n)
+            self._search(path)
+            path.pop()
+            state.undo_option(n)
+
+    def solve(self) -> Tuple[int, List[int], int]:
+        """
+        :return: The optimal score, the path of choices reaching it, and the number of nodes expanded.
+        """
+        self._search([])
+        return self.best_score, self.best_path, self.nodes_expanded
+
+
+def branch_and_bound_high_score(init_state: GameState) -> Tuple[int, List[int], int]:
+    """
+    Exact solver: depth first branch and bound pruned by an admissible ScoreBound.
+    Memory grows with the number of turns only, unlike the breadth first searches.
+    :return: The optimal score, the path of choices reaching it, and the number of nodes expanded.
+    """
+    return BranchAndBoundSolver(init_state).solve()
+
+
+_shared_best_score = None
+
+
+def _init_parallel_worker(shared_best_score):
+    global _shared_best_score
+    _shared_best_score = shared_best_score
+
+
+class _SubtreeSolver(BranchAndBoundSolver):
+    """
+    Branch and bound of one subtree in a worker process, pruning against the best score of every worker.
+    A subtree is only cut by other workers' scores when it cannot reach them, never when it can tie them,
+    so it still finds its own first optimal game whenever that game is globally optimal.
+    """
+
+    def _is_cut(self, bound: int) -> bool:
+        return super()._is_cut(bound) or bound < _shared_best_score.get_obj().value
+
+    def _publish_best(self):
+        with _shared_best_score.get_lock():
+            if self.best_score > _shared_best_score.value:
+                _shared_best_score.value = self.best_score
+
+
+def _solve_subtree(task: Tuple[int, GameState, List[int]]) -> Tuple[int, Optional[int], List[int], int]:
+    task_idx, state, prefix = task
+    solver = _SubtreeSolver(state)
+    solver._search(prefix.copy())
+    return task_idx, solver.best_score, solver.best_path, solver.nodes_expanded
+
+
+def _collect_prefixes(solver: BranchAndBoundSolver, depth: int, path: List[int],
+                      lo_prefixes: List[Tuple[GameState, List[int]]]):
+    """
+    Helper Method listing the subtrees at a depth in the order the serial solver visits them.
+    """
+    if depth == 0 or solver.state.has_game_ended():
+        lo_prefixes.append((solver.state.clone(), path.copy()))
+        return
+    solver.nodes_expanded += 1
+    for bound, n in solver._get_ordered_children():
+        solver.state.choose_option(n)
+        path.append(n)
+        _collect_prefixes(solver, depth - 1, path, lo_prefixes)
+        path.pop()
+        solver.state.undo_option(n)
+
+
+def parallel_branch_and_bound_high_score(init_state: GameState, processes: Optional[int] = None,
+                                         split_depth: Optional[int] = None) -> Tuple[int, List[int], int]:
+    """
+    Branch and bound split at the first split_depth turns, with the subtrees farmed out to a process pool.
+    Workers share their best score, so each prunes with the others' results.
+    Returns exactly what branch_and_bound_high_score returns, except for the number of nodes expanded:
+    among optimal subtrees the first in serial visiting order wins, and within it the serial path is found.
+    param processes: Number of worker processes, the CPU count by default.
+    param split_depth: Turns expanded before farming out, by default enough for a few subtrees per process.
+    :return: The optimal score, the path of choices reaching it, and the number of nodes expanded.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    remaining_turns = init_state.turn_limit - init_state.turns_passed
+    if split_depth is None:
+        split_depth, subtree_count = 0, 1
+        while subtree_count < processes * 4:
+            subtree_count *= max(init_state.choice_count, 2)
+            split_depth += 1
+    split_depth = min(split_depth, remaining_turns)
+    prefix_solver = BranchAndBoundSolver(init_state)
+    lo_prefixes = []
+    _collect_prefixes(prefix_solver, split_depth, [], lo_prefixes)
+    tasks = [(task_idx, state, prefix) for task_idx, (state, prefix) in enumerate(lo_prefixes)]
+    shared_best_score = multiprocessing.Value("d", -math.inf)
+    results = []
+    with multiprocessing.Pool(processes, initializer=_init_parallel_worker, initargs=(shared_best_score,)) as pool:
+        for result in pool.imap_unordered(_solve_subtree, tasks):
+            results.append(result)
+    results.sort(key=lambda result: result[0])
+    best_score, best_path, nodes_expanded = None, [], prefix_solver.nodes_expanded
+    for task_idx, score, path, subtree_nodes in results:
+        nodes_expanded += subtree_nodes
+        if score is not None and (best_score is None or score > best_score):
+            best_score, best_path = score, path
+    return best_score, best_path, nodes_expanded
+
+
+def score_evaluation(state: GameState) -> float:
+    """
+    Evaluation function ranking states by their current score.
+    """
+    return state.score
+
+
+def beam_search_high_score(init_state: GameState, beam_width: int,
+                           evaluation: Callable[[GameState], float] = score_evaluation,
+                           batch_evaluation: Optional[Callable[[List[GameState]], Sequence[float]]] = None) \
+        -> Tuple[int, List[int]]:
+    """
+    Breadth first search keeping only the beam_width best states of every turn, as ranked by evaluation.
+    Equal boards are merged first, and the best states are picked by partial selection instead of a full sort,
+    so memory is O(beam_width) and time O(beam_width * choice_count * turns).
+    Pass ScoreBound(init_state).get_upper_bound as evaluation to rank states by their admissible bound instead,
+    or a batch_evaluation such as batch.get_frontier_scores to rank each turn's candidates in a single call.
+    """
+    if beam_width < 1:
+        raise ValueError("Invalid Beam Width Given")
+    beam = [(init_state, [])]
+    for i in range(init_state.turns_passed, init_state.turn_limit):
+        lo_new_states = TranspositionTable()
+        for state_on_turn, path in beam:
+            for n in range(init_state.choice_count):
+                state_n = state_on_turn.clone()
+                state_n.choose_option(n)
+                path_n = path.copy()
+                path_n.append(n)
+                lo_new_states.store(state_n, path_n)
+        lo_candidates = list(lo_new_states.table.items())
+        if batch_evaluation is not None:
+            values = batch_evaluation([state for state, path in lo_candidates])
+            best_indices = heapq.nlargest(beam_width, range(len(lo_candidates)), key=lambda idx: values[idx])
+            beam = [lo_candidates[idx] for idx in best_indices]
+        else:
+            beam = heapq.nlargest(beam_width, lo_candidates, key=lambda item: evaluation(item[0]))
+    best_state, best_path = max(beam, key=lambda item: item[0].score)
+    return best_state.score, best_path
+
+
+def benchmark_beam_search(seeds: Iterable[int], col_num: int, row_num: int, turn_limit: int, choice_count: int,
+                          beam_width: int,
+                          evaluation_factory: Optional[Callable[[GameState], Callable[[GameState], float]]] = None) \
+        -> Dict[str, float]:
+    """
+    Compares beam search against the exact branch and bound solver on a set of seeds.
+    param evaluation_factory: Builds the evaluation function of each seeded game, score_evaluation by default.
+    :return: The mean and max score gap, the share of seeds solved optimally and the time spent by either solver.
+    """
+    gaps, beam_time, exact_time = [], 0.0, 0.0
+    for seed_num in seeds:
+        state = GameState(col_num, row_num, turn_limit, choice_count, seed_num, BoardEngine.BITBOARD)
+        evaluation = evaluation_factory(state) if evaluation_factory is not None else score_evaluation
+        start_time = time.time()
+        beam_score, beam_path = beam_search_high_score(state, beam_width, evaluation)
+        beam_time += time.time() - start_time
+        start_time = time.time()
+        exact_score, exact_path, nodes_expanded = branch_and_bound_high_score(state)
+        exact_time += time.time() - start_time
+        gaps.append(exact_score - beam_score)
+    if not gaps:
+        raise ValueError("No Seeds Given")
+    return {
+        "mean_gap": sum(gaps) / len(gaps),
+        "max_gap": max(gaps),
+        "optimal_share": gaps.count(0) / len(gaps),
+        "beam_seconds": beam_time,
+        "exact_seconds": exact_time,
+    }
+
+
+def prune_percentage(memo: TranspositionTable, pct: float):
     memo_length = len(memo)
     states = sorted(list(memo.keys()), key=lambda key: key.score, reverse=True)
     for i in range(int(memo_length * pct)):
@@ -109,7 +496,7 @@ def prune_percentage(memo: Dict[GameState, List[int]], pct: float):
 
 
 if __name__ == "__main__":
-    config_state = GameState(6, 6, 12, 2, 0)
+    config_state = GameState(6, 6, 12, 2, 0, BoardEngine.BITBOARD)
     print("-------------------------------------------------")
     start_time = time.time()
     print("Running BFS HighScore")
@@ -128,13 +515,35 @@ if __name__ == "__main__":
     print(optimal_path)
     print("-------------------------------------------------")
     start_time = time.time()
-    print("Running Depth Limited BFS HighScore With Pruning")
-    high_score, optimal_path = depth_limited_bfs_high_score(config_state, 5, 0.2)
+    print("Running Branch And Bound HighScore")
+    high_score, optimal_path, nodes_expanded = branch_and_bound_high_score(config_state)
+    print("--- %s seconds ---" % (time.time() - start_time))
+    print("Computed High Score is: " + str(high_score))
+    print("Nodes Expanded: " + str(nodes_expanded))
+    print("Computed Optimal Path:")
+    print(optimal_path)
+    print("-------------------------------------------------")
+    start_time = time.time()
+    print("Running Parallel Branch And Bound HighScore")
+    high_score, optimal_path, nodes_expanded = parallel_branch_and_bound_high_score(config_state)
     print("--- %s seconds ---" % (time.time() - start_time))
     print("Computed High Score is: " + str(high_score))
+    print("Nodes Expanded: " + str(nodes_expanded))
     print("Computed Optimal Path:")
     print(optimal_path)
     print("-------------------------------------------------")
+    start_time = time.time()
+    print("Running Beam Search HighScore")
+    high_score, optimal_path = beam_search_high_score(config_state, 64)
+    print("--- %s seconds ---" % (time.time() - start_time))
+    print("Computed High Score is: " + str(high_score))
+    print("Computed Optimal Path:")
+    print(optimal_path)
+    print("-------------------------------------------------")
+    print("Benchmarking Beam Search Against Branch And Bound On 20 Seeds")
+    for width in (8, 64):
+        print("Beam Width " + str(width) + ": " + str(benchmark_beam_search(range(20), 6, 6, 12, 2, width)))
+    print("-------------------------------------------------")
     print("Running Simulation Using Optimal Path...")
     state = config_state
     for choice in optimal_path:
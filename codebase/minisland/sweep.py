@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from codebase.minisland.model import GameState, BoardEngine
+from codebase.minisland.search import branch_and_bound_high_score
+import argparse
+import multiprocessing
+import numpy as np
+import os
+import time
+
+SWEEP_COLUMNS = ("seed", "score", "path", "nodes_expanded", "wall_time")
+
+
+def solve_seed(task: Tuple[int, int, int, int, int]) -> Tuple[int, int, List[int], int, float]:
+    """
+    Solves one seeded game exactly.
+    param task: A tuple of (col_num, row_num, turn_limit, choice_count, seed_num).
+    :return: The seed, its optimal score, the path reaching it, the nodes expanded and the wall time in seconds.
+    """
+    col_num, row_num, turn_limit, choice_count, seed_num = task
+    start_time = time.time()
+    state = GameState(col_num, row_num, turn_limit, choice_count, seed_num, BoardEngine.BITBOARD)
+    score, path, nodes_expanded = branch_and_bound_high_score(state)
+    return seed_num, score, path, nodes_expanded, time.time() - start_time
+
+
+def load_sweep(output_path: str) -> Dict[str, np.ndarray]:
+    """
+    Loads a sweep file: one array per column of SWEEP_COLUMNS, plus the board config it was solved with.
+    Rows are sorted by seed; "path" holds one row of choices per seed.
+    """
+    with np.load(output_path) as data:
+        return {name: data[name] for name in SWEEP_COLUMNS + ("config",)}
+
+
+def _write_sweep(output_path: str, config: Tuple[int, int, int, int], rows: Dict[int, tuple]):
+    """
+    Helper Method writing every solved row, sorted by seed. The file is replaced atomically,
+    so an interrupted sweep always leaves a readable file behind.
+    """
+    seeds = sorted(rows)
+    turn_limit = config[2]
+    paths = np.zeros((len(seeds), turn_limit), dtype=np.int8)
+    for row_idx, seed_num in enumerate(seeds):
+        paths[row_idx, :] = rows[seed_num][1]
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as tmp_file:
+        np.savez(tmp_file,
+                 seed=np.array(seeds, dtype=np.int64),
+                 score=np.array([rows[seed_num][0] for seed_num in seeds], dtype=np.int64),
+                 path=paths,
+                 nodes_expanded=np.array([rows[seed_num][2] for seed_num in seeds], dtype=np.int64),
+                 wall_time=np.array([rows[seed_num][3] for seed_num in seeds], dtype=np.float64),
+                 config=np.array(config, dtype=np.int64))
+    os.replace(tmp_path, output_path)
+
+
+def run_seed_sweep(output_path: str, seeds: Iterable[int], col_num: int, row_num: int, turn_limit: int,
+                   choice_count: int, processes: Optional[int] = None, chunk_size: int = 256) -> int:
+    """
+    Solves every seed exactly across a process pool and stores the results in a columnar .npz file.
+    Seeds already present in the output file are skipped, so an interrupted sweep resumes where it stopped.
+    param chunk_size: Number of newly solved seeds between two writes of the output file.
+    :return: The number of seeds solved by this call.
+    """
+    config = (col_num, row_num, turn_limit, choice_count)
+    rows = dict()
+    if os.path.exists(output_path):
+        sweep = load_sweep(output_path)
+        if tuple(sweep["config"]) != config:
+            raise ValueError("Sweep Output Has Different Board Config")
+        for row_idx, seed_num in enumerate(sweep["seed"]):
+            rows[int(seed_num)] = (int(sweep["score"][row_idx]), sweep["path"][row_idx].tolist(),
+                                   int(sweep["nodes_expanded"][row_idx]), float(sweep["wall_time"][row_idx]))
+    tasks = [config + (seed_num,) for seed_num in seeds if seed_num not in rows]
+    if not tasks:
+        return 0
+    solved_count = 0
+    with multiprocessing.Pool(processes) as pool:
+        for seed_num, score, path, nodes_expanded, wall_time in pool.imap_unordered(solve_seed, tasks):
+            rows[seed_num] = (score, path, nodes_expanded, wall_time)
+            solved_count += 1
+            if solved_count % chunk_size == 0:
+                _write_sweep(output_path, config, rows)
+    _write_sweep(output_path, config, rows)
+    return solved_count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a range of minisland seeds to optimality.")
+    parser.add_argument("output", help="Path of the .npz sweep file, resumed if it exists.")
+    parser.add_argument("--seeds", type=int, nargs=2, metavar=("START", "STOP"), required=True,
+                        help="Half open range of seeds to solve.")
+    parser.add_argument("--board", type=int, nargs=2, metavar=("COLS", "ROWS"), default=(6, 6))
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--choices", type=int, default=2)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+    print("-------------------------------------------------")
+    start_time = time.time()
+    print("Running Seed Sweep " + str(args.seeds[0]) + " To " + str(args.seeds[1]))
+    solved = run_seed_sweep(args.output, range(args.seeds[0], args.seeds[1]), args.board[0], args.board[1],
+                            args.turns, args.choices, args.processes, args.chunk_size)
+    print("--- %s seconds ---" % (time.time() - start_time))
+    print("Seeds Solved: " + str(solved))
+    print("-------------------------------------------------")
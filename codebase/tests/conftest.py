@@ -0,0 +1,8 @@
+import os
+import sys
+
+CODEBASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# tinyisland imports itself as a top level package, minisland through the codebase package.
+for import_dir in (CODEBASE_DIR, os.path.dirname(CODEBASE_DIR)):
+    if import_dir not in sys.path:
+        sys.path.insert(0, import_dir)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from tinyisland.agent import RandomAgent, evaluate_agent, get_lookahead_rewards, play_game
+from tinyisland.env import TinyIslandsWithoutIslands, EnvSnapshot, TURN_LIMIT, INVALID_ACTION_REWARD
+from tinyisland.State import State
+from tinyisland.Tile import TileType
+
+
+def _get_best_final_score(state: State, depth: int) -> int:
+    if depth == 0 or state.is_terminal():
+        return state.get_score()
+    best_score = None
+    for move in state.get_legal_moves():
+        child = state.clone()
+        child.apply_move(*move)
+        child_score = _get_best_final_score(child, depth - 1)
+        best_score = child_score if best_score is None else max(best_score, child_score)
+    return best_score
+
+
+def _get_exhaustive_rewards(state: State, depth: int) -> np.ndarray:
+    rewards = np.full((state.choice_num, state.col_num), INVALID_ACTION_REWARD)
+    for choice_idx, choice in enumerate(state.choices[state.turns_passed]):
+        if choice.tile_type == TileType.EMPTY:
+            continue
+        for pos_idx, pos in enumerate(state.choice_positions[state.turns_passed][choice_idx]):
+            if not state.board.is_position_occupied(pos):
+                child = state.clone()
+                child.apply_move(choice_idx, pos)
+                rewards[choice_idx, pos_idx] = _get_best_final_score(child, depth - 1) - state.get_score()
+    return rewards
+
+
+def test_lookahead_rewards_end_lines_on_blocked_turns():
+    seed_num, turns_passed, depth = 3, 3, 3
+    env = TinyIslandsWithoutIslands()
+    env.reset(seed=seed_num)
+    state = State(seed_num, turn_limit=TURN_LIMIT)
+    # Fill the ranges of the next turn but one tile the current turn can take, so taking it ends the game.
+    current_positions = {pos for choice in state.choice_positions[turns_passed] for pos in choice}
+    next_positions = {pos for choice in state.choice_positions[turns_passed + 1] for pos in choice}
+    last_pos = min(current_positions & next_positions, key=lambda pos: (pos.row, pos.col))
+    for pos in next_positions - {last_pos}:
+        state.board.add_tile_type_at_position(TileType.MOUNTAIN, pos)
+    state.turns_passed = turns_passed
+    env.set_state(EnvSnapshot(state.board.clone(), turns_passed, env.choices))
+    blocked_state = state.clone()
+    blocked_state.apply_move(next(choice_idx for choice_idx, positions in
+                                  enumerate(state.choice_positions[turns_passed]) if last_pos in positions), last_pos)
+    assert blocked_state.is_terminal()
+    assert np.array_equal(get_lookahead_rewards(env, depth), _get_exhaustive_rewards(state, depth))
+
+
+def test_lookahead_rewards_match_exhaustive_play():
+    env = TinyIslandsWithoutIslands()
+    for seed_num in range(3):
+        env.reset(seed=seed_num)
+        state = State(seed_num, turn_limit=TURN_LIMIT)
+        assert np.array_equal(get_lookahead_rewards(env, 2), _get_exhaustive_rewards(state, 2))
+
+
+def test_evaluate_agent_seeds_every_game_from_its_seed():
+    lo_seeds = list(range(6))
+    result = evaluate_agent(RandomAgent(seed=0), lo_seeds, 2)
+    assert result["scores"] == [play_game(RandomAgent(seed=seed_num), seed_num) for seed_num in lo_seeds]
@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+
+from tinyisland.env import TinyIslandsWithoutIslands, TURN_LIMIT, CHOICE_NUM, INVALID_ACTION_REWARD
+from tinyisland.State import State
+
+
+def test_env_terminates_with_state_on_blocked_turns():
+    env = TinyIslandsWithoutIslands()
+    rng = random.Random(0)
+    for seed_num in range(40):
+        _, info = env.reset(seed=seed_num)
+        state = State(seed_num, turn_limit=TURN_LIMIT)
+        terminated = state.is_terminal()
+        while not terminated:
+            choice_idx, pos = rng.choice(state.get_legal_moves())
+            state.apply_move(choice_idx, pos)
+            _, terminated, _, done, info = env.step({"choice": choice_idx,
+                                                     "target_position": np.array((pos.col, pos.row))})
+            assert not done
+            assert terminated == state.is_terminal()
+        assert not info["action_mask"].any()
+        assert env.board.get_score() == state.get_score()
+
+
+def test_candidate_rewards_match_stepping_every_action():
+    env = TinyIslandsWithoutIslands()
+    rng = random.Random(1)
+    for seed_num in range(5):
+        _, info = env.reset(seed=seed_num)
+        terminated = not info["action_mask"].any()
+        while not terminated:
+            rewards = env.get_candidate_rewards()
+            for choice_idx in range(CHOICE_NUM):
+                for pos_idx, pos in enumerate(env.choices[env.turns_passed]["choice" + str(choice_idx)]
+                                              ["target_positions"]):
+                    if not env.get_action_mask()[choice_idx, pos.row, pos.col]:
+                        assert rewards[choice_idx, pos_idx] == INVALID_ACTION_REWARD
+                        continue
+                    _, _, reward, _, _ = env.clone().step({"choice": choice_idx,
+                                                           "target_position": np.array((pos.col, pos.row))})
+                    assert rewards[choice_idx, pos_idx] == reward
+            choice_idx, row, col = rng.choice(np.argwhere(info["action_mask"]).tolist())
+            _, terminated, _, _, info = env.step({"choice": choice_idx, "target_position": np.array((col, row))})
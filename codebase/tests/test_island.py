@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import numpy as np
+
+from tinyisland.Island import IslandPlacements, ISLAND_CACHE_DIR_VARIABLE
+
+
+def _assert_same_placements(placements: IslandPlacements, other: IslandPlacements):
+    assert np.array_equal(placements.island_bits, other.island_bits)
+    assert np.array_equal(placements.shore_bits, other.shore_bits)
+    assert np.array_equal(placements.shape_ids, other.shape_ids)
+
+
+def test_island_placements_stay_in_memory_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    monkeypatch.delenv(ISLAND_CACHE_DIR_VARIABLE, raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    IslandPlacements.get(4, 4, 3)
+    assert not os.listdir(tmp_path)
+
+
+def test_island_placements_use_the_cache_dir_variable(tmp_path, monkeypatch):
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    monkeypatch.setenv(ISLAND_CACHE_DIR_VARIABLE, str(tmp_path))
+    placements = IslandPlacements.get(4, 4, 3)
+    assert os.listdir(tmp_path) == ["islands_4x4_3.npz"]
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    _assert_same_placements(IslandPlacements.get(4, 4, 3), placements)
+
+
+def test_island_placements_rebuild_cache_files_not_matching(tmp_path, monkeypatch):
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    monkeypatch.delenv(ISLAND_CACHE_DIR_VARIABLE, raising=False)
+    expected = IslandPlacements.get(5, 4, 3)
+    cache_path = tmp_path / "islands_5x4_3.npz"
+    IslandPlacements.get(4, 5, 3, str(tmp_path))
+    shutil.move(str(tmp_path / "islands_4x5_3.npz"), str(cache_path))
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    _assert_same_placements(IslandPlacements.get(5, 4, 3, str(tmp_path)), expected)
+    cache_path.write_bytes(b"not a cache file")
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    _assert_same_placements(IslandPlacements.get(5, 4, 3, str(tmp_path)), expected)
+    monkeypatch.setattr(IslandPlacements, "_cache", dict())
+    _assert_same_placements(IslandPlacements.get(5, 4, 3, str(tmp_path)), expected)
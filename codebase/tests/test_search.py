@@ -0,0 +1,41 @@
+from codebase.minisland.model import GameState, BoardEngine
+from codebase.minisland.search import ScoreBound, branch_and_bound_high_score, parallel_branch_and_bound_high_score
+
+
+def _get_best_final_score(state: GameState, score_bound: ScoreBound) -> int:
+    """
+    Helper Method searching every game from the state, checking the bound of every state on the way.
+    """
+    if state.has_game_ended():
+        return state.score
+    best_score = None
+    for option in range(state.choice_count):
+        state.choose_option(option)
+        child_score = _get_best_final_score(state, score_bound)
+        state.undo_option(option)
+        best_score = child_score if best_score is None else max(best_score, child_score)
+    assert score_bound.get_upper_bound(state) >= best_score
+    return best_score
+
+
+def test_branch_and_bound_matches_exhaustive_search():
+    for board_engine in (BoardEngine.DICT, BoardEngine.BITBOARD):
+        for seed_num in range(6):
+            for col_num, row_num, turn_limit, choice_count in ((3, 3, 4, 2), (4, 4, 5, 3)):
+                state = GameState(col_num, row_num, turn_limit, choice_count, seed_num, board_engine)
+                best_score = _get_best_final_score(state.clone(), ScoreBound(state))
+                score, path, _ = branch_and_bound_high_score(state)
+                assert score == best_score
+                replayed_state = state.clone()
+                for option in path:
+                    replayed_state.choose_option(option)
+                assert replayed_state.has_game_ended() and replayed_state.score == best_score
+
+
+def test_parallel_branch_and_bound_matches_serial():
+    for seed_num in range(4):
+        for split_depth in (None, 1, 3):
+            state = GameState(4, 4, 6, 2, seed_num, BoardEngine.BITBOARD)
+            score, path, _ = branch_and_bound_high_score(state)
+            parallel_score, parallel_path, _ = parallel_branch_and_bound_high_score(state, 2, split_depth)
+            assert (parallel_score, parallel_path) == (score, path)
@@ -0,0 +1,41 @@
+from tinyisland.solver import get_upper_bound, solve_game
+from tinyisland.State import State
+
+
+def _get_best_final_score(state: State) -> int:
+    """
+    Helper Method searching every game from the state, checking the bound of every state on the way.
+    """
+    lo_moves = state.get_legal_moves()
+    if not lo_moves:
+        return state.get_score()
+    best_score = None
+    for move in lo_moves:
+        child = state.clone()
+        child.apply_move(*move)
+        child_score = _get_best_final_score(child)
+        best_score = child_score if best_score is None else max(best_score, child_score)
+    assert get_upper_bound(state) >= best_score
+    return best_score
+
+
+def test_solver_matches_exhaustive_search_on_short_games():
+    for seed_num in range(6):
+        for board_size, turn_limit in ((4, 4), (3, 5)):
+            state = State(seed_num, col_num=board_size, row_num=board_size, turn_limit=turn_limit)
+            best_score = _get_best_final_score(state.clone())
+            result = solve_game(state)
+            assert result.best_score == best_score
+            assert result.is_optimal and result.upper_bound == best_score
+            replayed_state = state.clone()
+            for move in result.best_path:
+                replayed_state.apply_move(*move)
+            assert replayed_state.is_terminal() and replayed_state.get_score() == best_score
+
+
+def test_solver_bound_holds_within_a_budget():
+    for seed_num in range(3):
+        state = State(seed_num, col_num=4, row_num=4, turn_limit=6)
+        best_score = _get_best_final_score(state.clone())
+        result = solve_game(state, node_limit=50)
+        assert result.best_score <= best_score <= result.upper_bound
@@ -0,0 +1,44 @@
+import numpy as np
+
+from tinyisland.env import TinyIslandsWithoutIslands, EnvSnapshot, TARGET_POSITION_GROUPS, BOARD_SIZE, CHOICE_NUM
+from tinyisland.Board import Board, TILE_TYPES
+from tinyisland.Tile import Position
+from tinyisland.vec_env import TinyIslandVecEnv, _sample_valid_actions, check_scores
+
+
+def _get_single_env(vec_env: TinyIslandVecEnv, env_idx: int) -> TinyIslandsWithoutIslands:
+    """
+    Helper Method replaying a game of the vectorized env on a single env.
+    """
+    board = Board()
+    for flat_idx, code in enumerate(vec_env.types[env_idx, :BOARD_SIZE * BOARD_SIZE]):
+        if code:
+            board.add_tile_type_at_position(TILE_TYPES[code], Position(flat_idx % BOARD_SIZE, flat_idx // BOARD_SIZE))
+    turn_num = int(vec_env.turns_passed[env_idx])
+    choices = [None] * turn_num + [
+        {"choice" + str(choice_idx): {"tile_type": int(vec_env.choice_tile_types[env_idx, turn_num, choice_idx]),
+                                      "target_group": int(vec_env.choice_targets[env_idx, turn_num, choice_idx]),
+                                      "target_positions": TARGET_POSITION_GROUPS[
+                                          vec_env.choice_targets[env_idx, turn_num, choice_idx] // BOARD_SIZE][
+                                          vec_env.choice_targets[env_idx, turn_num, choice_idx] % BOARD_SIZE]}
+         for choice_idx in range(CHOICE_NUM)}]
+    env = TinyIslandsWithoutIslands()
+    env.reset(seed=0)
+    env.set_state(EnvSnapshot(board, turn_num, choices))
+    return env
+
+
+def test_vec_env_observes_games_as_the_single_env():
+    vec_env = TinyIslandVecEnv(16, seed=0)
+    observation, info = vec_env.reset()
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        assert vec_env.observation_space.contains(observation)
+        for env_idx in range(vec_env.num_envs):
+            env = _get_single_env(vec_env, env_idx)
+            for key, arr in env.observation.items():
+                assert np.array_equal(observation[key][env_idx], arr), key
+            assert np.array_equal(info["action_mask"][env_idx], env.get_action_mask())
+        observation, _, _, done, info = vec_env.step(*_sample_valid_actions(rng, info["action_mask"]))
+        assert not done.any()
+        check_scores(vec_env, observation)
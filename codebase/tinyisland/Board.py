@@ -1,6 +1,10 @@
-from typing import List
+from collections import deque
+from typing import List, Tuple, Optional
 
-from Tile import Position, TileData, AdjacencyInfo, TileType, ON_ISLAND_TILE_TYPES
+import numpy as np
+
+from tinyisland.Island import IslandEngine, IslandPlacements, iter_mask_indices
+from tinyisland.Tile import Position, AdjacencyTable, TileType, ON_ISLAND_TILE_TYPES, OFF_ISLAND_TILE_TYPES
 
 PENALTY_PER_INVALID_TILE = -5
 HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY = 2
@@ -12,222 +16,544 @@ BEACHES_REWARD_IF_ON_SHORE = 1
 WAVES_REWARD_IF_UNIQUE_COLUMN_ROW = 2
 
 
+TILE_TYPES = tuple(TileType)
+TILE_TYPE_CODES = {tile_type: code for code, tile_type in enumerate(TileType)}
+ON_ISLAND_TILE_CODES = [TILE_TYPE_CODES[tile_type] for tile_type in ON_ISLAND_TILE_TYPES]
+OFF_ISLAND_TILE_CODES = [TILE_TYPE_CODES[tile_type] for tile_type in OFF_ISLAND_TILE_TYPES]
+EMPTY_CODE, HOUSES_CODE, CHURCHES_CODE, FOREST_CODE, MOUNTAIN_CODE, BOATS_CODE, WAVES_CODE, BEACHES_CODE = \
+    (TILE_TYPE_CODES[tile_type] for tile_type in (TileType.EMPTY, TileType.HOUSES, TileType.CHURCHES, TileType.FOREST,
+                                                  TileType.MOUNTAIN, TileType.BOATS, TileType.WAVES, TileType.BEACHES))
+UNREACHABLE_DISTANCE = 255
+ADJACENT_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+NEAR_OFFSETS = ADJACENT_OFFSETS + ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _sum_neighbors(padded: np.ndarray, offsets: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+    """
+    Sums the neighbors at the given offsets of every tile, given arrays padded by one tile on each side
+    of their last two axes.
+    """
+    row_num, col_num = padded.shape[-2] - 2, padded.shape[-1] - 2
+    total = np.zeros(padded.shape[:-2] + (row_num, col_num), dtype=np.int16)
+    for d_col, d_row in offsets:
+        total += padded[..., 1 + d_row:row_num + 1 + d_row, 1 + d_col:col_num + 1 + d_col]
+    return total
+
+
+def _get_island_distances(targets: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Steps from every tile to the closest target tile moving across valid tiles only, UNREACHABLE_DISTANCE if none.
+    Relaxes a multi-source distance field with shifted minimums until it stops changing.
+    """
+    row_num, col_num = targets.shape[-2:]
+    unreachable = row_num * col_num
+    padded = np.full(targets.shape[:-2] + (row_num + 2, col_num + 2), unreachable, dtype=np.int16)
+    distances = padded[..., 1:-1, 1:-1]
+    distances[targets] = 0
+    while True:
+        closest = distances.copy()
+        for d_col, d_row in ADJACENT_OFFSETS:
+            np.minimum(closest, padded[..., 1 + d_row:row_num + 1 + d_row, 1 + d_col:col_num + 1 + d_col] + 1,
+                       out=closest)
+        closest[~valid] = unreachable
+        if np.array_equal(closest, distances):
+            break
+        distances[...] = closest
+    return np.where(distances >= unreachable, UNREACHABLE_DISTANCE, distances)
+
+
+def get_tile_rule_scores(types: np.ndarray, unique_types_nearby, houses_nearby, forests_adjacent, forests_nearby,
+                         boat_distances, is_lone_wave, on_shore, unreachable_score: int) -> np.ndarray:
+    """
+    The scoring rules of valid tiles, applied elementwise to tile type codes and the counts around those tiles.
+    Every vectorized scorer, score_tile_arrays and TinyIslandVecEnv, derives its tile scores from here, so a rule
+    change is made here and in the per-tile helpers of Board only. The island terms of churches and the penalty of
+    invalid tiles are applied on top by score_tile_arrays.
+    Counts are arrays broadcastable to types, or scalars for tile types the caller knows are absent.
+    param boat_distances: Steps to the closest island tile, UNREACHABLE_DISTANCE if there is none.
+    param unreachable_score: The score of a boat without any island tile to reach, the larger board dimension.
+    """
+    return np.select(
+        [types == HOUSES_CODE, types == CHURCHES_CODE, types == FOREST_CODE, types == MOUNTAIN_CODE,
+         types == BOATS_CODE, types == WAVES_CODE, types == BEACHES_CODE],
+        [HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY * np.asarray(unique_types_nearby),
+         CHURCHES_REWARD_PER_HOUSES_NEARBY * np.asarray(houses_nearby),
+         FOREST_REWARD_PER_FOREST_ADJACENT * np.asarray(forests_adjacent),
+         MOUNTAIN_REWARD_PER_FOREST_NEARBY * np.asarray(forests_nearby),
+         np.where(np.asarray(boat_distances) == UNREACHABLE_DISTANCE, unreachable_score, boat_distances),
+         np.where(is_lone_wave, WAVES_REWARD_IF_UNIQUE_COLUMN_ROW, 0),
+         np.where(on_shore, BEACHES_REWARD_IF_ON_SHORE, 0)], 0).astype(np.int16)
+
+
+def score_tile_arrays(types: np.ndarray, valid: np.ndarray, on_island: np.ndarray, on_shore: np.ndarray,
+                      island_ids: np.ndarray) -> np.ndarray:
+    """
+    Vectorized scoring of every tile, identical to Board._get_score_at_position.
+    Arrays are shaped as returned by Board.get_score_arrays, optionally with leading batch axes.
+    Neighbor counts of every tile type come from summing shifted views of a padded one-hot encoding, and are turned
+    into scores by get_tile_rule_scores.
+    :return: The score of every tile, in the shape of types.
+    """
+    shape = types.shape
+    row_num, col_num = shape[-2:]
+    types, valid, on_island, on_shore, island_ids = \
+        (arr.reshape((-1, row_num, col_num)) for arr in (types, valid, on_island, on_shore, island_ids))
+    board_num = types.shape[0]
+    is_type = types[:, None] == np.arange(len(TILE_TYPE_CODES)).reshape((1, -1, 1, 1))
+    one_hot = np.zeros((board_num, len(TILE_TYPE_CODES), row_num + 2, col_num + 2), dtype=np.int8)
+    one_hot[:, :, 1:-1, 1:-1] = is_type & valid[:, None]
+    near_counts = _sum_neighbors(one_hot, NEAR_OFFSETS)
+
+    boat_distances = UNREACHABLE_DISTANCE
+    if is_type[:, BOATS_CODE].any():
+        targets = one_hot[:, ON_ISLAND_TILE_CODES, 1:-1, 1:-1].any(axis=1) | (valid & on_island)
+        boat_distances = _get_island_distances(targets, valid)
+    waves = one_hot[:, WAVES_CODE, 1:-1, 1:-1]
+    other_waves = waves.sum(axis=-1, keepdims=True) + waves.sum(axis=-2, keepdims=True) - 2 * waves
+    forests_adjacent = _sum_neighbors(one_hot[:, FOREST_CODE], ADJACENT_OFFSETS)
+    scores = get_tile_rule_scores(types, (near_counts[:, 1:] > 0).sum(axis=1), near_counts[:, HOUSES_CODE],
+                                  forests_adjacent, near_counts[:, FOREST_CODE], boat_distances,
+                                  (waves == 1) & (other_waves == 0), on_shore, max(row_num, col_num))
+
+    churches = is_type[:, CHURCHES_CODE] & (island_ids > 0)
+    if churches.any():
+        houses, island_churches = one_hot[:, HOUSES_CODE, 1:-1, 1:-1], one_hot[:, CHURCHES_CODE, 1:-1, 1:-1]
+        padded_ids = np.zeros((board_num, row_num + 2, col_num + 2), dtype=island_ids.dtype)
+        padded_ids[:, 1:-1, 1:-1] = island_ids
+        houses_nearby_on_island = np.zeros(types.shape, dtype=np.int16)
+        for d_col, d_row in NEAR_OFFSETS:
+            houses_nearby_on_island += \
+                one_hot[:, HOUSES_CODE, 1 + d_row:row_num + 1 + d_row, 1 + d_col:col_num + 1 + d_col] * \
+                (padded_ids[:, 1 + d_row:row_num + 1 + d_row, 1 + d_col:col_num + 1 + d_col] == island_ids)
+        island_num = int(island_ids.max()) + 1
+        board_island_ids = island_ids + island_num * np.arange(board_num).reshape((-1, 1, 1))
+        houses_on_island = np.bincount(board_island_ids.ravel(), weights=houses.ravel(),
+                                       minlength=island_num * board_num)[board_island_ids]
+        churches_on_island = np.bincount(board_island_ids.ravel(), weights=island_churches.ravel(),
+                                         minlength=island_num * board_num)[board_island_ids]
+        scores[churches] += (CHURCHES_REWARD_PER_OTHER_HOUSES_ON_ISLAND *
+                             (houses_on_island - houses_nearby_on_island)).astype(np.int16)[churches]
+        scores[churches & (churches_on_island > 1)] = 0
+
+    scores[~valid] = PENALTY_PER_INVALID_TILE
+    return scores.reshape(shape)
+
+
+def get_batched_scores(types: np.ndarray, valid: Optional[np.ndarray] = None, on_island: Optional[np.ndarray] = None,
+                       on_shore: Optional[np.ndarray] = None, island_ids: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Scores N boards in one vectorized call, identically to Board.get_score.
+    param types: Array of shape (N, row_num, col_num) of tile type codes, in TileType definition order.
+    Masks have the same shape; omitted masks default to every tile valid and no islands or shores.
+    :return: Array of the N scores.
+    """
+    valid = np.ones(types.shape, dtype=bool) if valid is None else valid
+    on_island = np.zeros(types.shape, dtype=bool) if on_island is None else on_island
+    on_shore = np.zeros(types.shape, dtype=bool) if on_shore is None else on_shore
+    island_ids = np.zeros(types.shape, dtype=np.int16) if island_ids is None else island_ids
+    return score_tile_arrays(types, valid, on_island, on_shore, island_ids).sum(axis=(-2, -1), dtype=np.int64)
+
+
+def get_strict_valid(types: np.ndarray, on_island: np.ndarray) -> np.ndarray:
+    """
+    Validity of every tile after the strict revalidation of get_score(is_lenient=False): on island types are valid
+    on islands only, off island types off islands only, and empty tiles are always valid.
+    """
+    return np.where(np.isin(types, ON_ISLAND_TILE_CODES), on_island,
+                    ~np.isin(types, OFF_ISLAND_TILE_CODES) | ~on_island)
+
+
+def stack_score_arrays(lo_boards: List["Board"]) -> Tuple[np.ndarray, ...]:
+    """
+    Stacks the score arrays of boards of the same size into the (N, row_num, col_num) arrays get_batched_scores takes.
+    """
+    return tuple(np.stack(arrays) for arrays in zip(*(board.get_score_arrays() for board in lo_boards)))
+
+
 class Board:
+    """
+    A structure of arrays board: one byte per tile, at its flat index (row * col_num + col), in each of the type code,
+    occupied, on island, on shore, validity and island id arrays. Copying a board copies a few small buffers.
+    Church and boat scoring read cached island aggregates and a distance to island field instead of searching.
+    The score is maintained incrementally: changes mark the tiles whose score they may affect as dirty, and only
+    those are rescored.
+    """
+    __slots__ = ("col_num", "row_num", "adjacency", "types", "occupied", "on_island", "on_shore", "valid", "islands",
+                 "island_ids", "island_tile_indices", "island_house_counts", "island_church_counts",
+                 "island_distances", "distances_dirty", "tile_scores", "score", "dirty_tiles", "island_mask")
+
     def __init__(self, col_num: int = 9, row_num: int = 9):
         self.col_num = col_num
         self.row_num = row_num
-        self.tile_map = dict()
+        self.adjacency = AdjacencyTable.get(col_num, row_num)
+        tile_count = col_num * row_num
+        self.types = bytearray(tile_count)
+        self.occupied = bytearray(tile_count)
+        self.on_island = bytearray(tile_count)
+        self.on_shore = bytearray(tile_count)
+        self.valid = bytearray(b"\x01" * tile_count)
         self.islands = []
-        for r in range(row_num):
-            for c in range(col_num):
-                pos = Position(c, r)
-                adj_info = self._generate_adjacency_info(pos)
-                self.tile_map[pos] = TileData(pos, adj_info)
-
-    def _generate_adjacency_info(self, pos: Position) -> AdjacencyInfo:
-        """
-        Helper Method for generating valid adjacency info.
-        param pos: A tuple of two ints representing the position from which to generate adjacency info.
-        :return: A tuple of two list of ints representing touching tiles and nearby tiles.
-        """
-        pos_x, pos_y = pos.col, pos.row
-        adj, near, col, row = [], [], [], []
-        if pos_x < self.col_num - 1:
-            adj.append(Position(pos_x + 1, pos_y))
-        if pos_x > 0:
-            adj.append(Position(pos_x - 1, pos_y))
-        if pos_y < self.row_num - 1:
-            adj.append(Position(pos_x, pos_y + 1))
-        if pos_y > 0:
-            adj.append(Position(pos_x, pos_y - 1))
-        if pos_x < self.col_num - 1 and pos_y < self.row_num - 1:
-            near.append(Position(pos_x + 1, pos_y + 1))
-        if pos_x < self.col_num - 1 and pos_y > 0:
-            near.append(Position(pos_x + 1, pos_y - 1))
-        if pos_x > 0 and pos_y < self.row_num - 1:
-            near.append(Position(pos_x - 1, pos_y + 1))
-        if pos_x > 0 and pos_y > 0:
-            near.append(Position(pos_x - 1, pos_y - 1))
-        for r in range(self.row_num - 1):
-            if r != pos_y:
-                col.append(Position(pos_x, r))
-        for c in range(self.col_num - 1):
-            if c != pos_x:
-                row.append(Position(pos_y, c))
-        return AdjacencyInfo(adj, near, col, row)
-
-    def _get_tile_at_position(self, pos: Position) -> TileData:
-        """
-        Helper getter method for single tile data.
+        self.island_ids = bytearray(tile_count)
+        self.island_tile_indices = [()]
+        self.island_house_counts = [0]
+        self.island_church_counts = [0]
+        self.island_distances = bytearray(b"\xff" * tile_count)
+        self.distances_dirty = False
+        self.tile_scores = [0] * tile_count
+        self.score = 0
+        self.dirty_tiles = set()
+        self.island_mask = 0
+
+    def clone(self) -> "Board":
+        """
+        :return: An independent copy of the board. Islands are never mutated once added, so they are shared.
+        """
+        other = Board.__new__(Board)
+        other.col_num = self.col_num
+        other.row_num = self.row_num
+        other.adjacency = self.adjacency
+        other.types = self.types[:]
+        other.occupied = self.occupied[:]
+        other.on_island = self.on_island[:]
+        other.on_shore = self.on_shore[:]
+        other.valid = self.valid[:]
+        other.islands = self.islands[:]
+        other.island_ids = self.island_ids[:]
+        other.island_tile_indices = self.island_tile_indices[:]
+        other.island_house_counts = self.island_house_counts[:]
+        other.island_church_counts = self.island_church_counts[:]
+        other.island_distances = self.island_distances[:]
+        other.distances_dirty = self.distances_dirty
+        other.tile_scores = self.tile_scores[:]
+        other.score = self.score
+        other.dirty_tiles = set(self.dirty_tiles)
+        other.island_mask = self.island_mask
+        return other
+
+    def __copy__(self):
+        return self.clone()
+
+    def __deepcopy__(self, memo):
+        return self.clone()
+
+    def _get_index_at_position(self, pos: Position) -> int:
+        """
+        Helper getter method for the flat index of a tile.
         param pos: A tuple of two ints representing the position (COORDINATES).
-        :return: TileData at the coordinate. Throws an Exception if the coordinate is outside the board.
+        :return: The flat index of the coordinate. Throws an Exception if the coordinate is outside the board.
         """
         x, y = pos.col, pos.row
         if x < 0 or y < 0 or x >= self.col_num or y >= self.row_num:
             raise ValueError("Position Outside Board Dimensions")
-        return self.tile_map[pos]
-
-    def _get_tiles_at_positions(self, lo_pos: List[Position]) -> List[TileData]:
-        """
-        param lo_pos: A list of tuples of two ints representing the position (COORDINATES).
-        :return: A list of TileData
-        """
-        lo_tiles = []
-        for pos in lo_pos:
-            lo_tiles.append(self._get_tile_at_position(pos))
-        return lo_tiles
+        return y * self.col_num + x
 
     def _get_score_at_position(self, tile_position: Position) -> int:
-        tar_tile = self._get_tile_at_position(tile_position)
-        if not tar_tile.is_valid:
+        return self._get_score_of_tile(self._get_index_at_position(tile_position))
+
+    def _get_score_of_tile(self, idx: int) -> int:
+        tile_code = self.types[idx]
+        if not self.valid[idx]:
             return PENALTY_PER_INVALID_TILE
-        elif tar_tile.type == TileType.HOUSES:
-            return self._get_score_helper_houses(tar_tile)
-        elif tar_tile.type == TileType.CHURCHES:
-            return self._get_score_helper_church(tar_tile)
-        elif tar_tile.type == TileType.FOREST:
-            return self._get_score_helper_forest(tar_tile)
-        elif tar_tile.type == TileType.MOUNTAIN:
-            return self._get_score_helper_mountain(tar_tile)
-        elif tar_tile.type == TileType.BEACHES:
-            return BEACHES_REWARD_IF_ON_SHORE if tar_tile.on_shore else 0
-        elif tar_tile.type == TileType.BOATS:
-            return self._get_score_helper_boats(tar_tile)
-        elif tar_tile.type == TileType.WAVES:
-            return self._get_score_helper_mountain(tar_tile)
+        elif tile_code == HOUSES_CODE:
+            return self._get_score_helper_houses(idx)
+        elif tile_code == CHURCHES_CODE:
+            return self._get_score_helper_church(idx)
+        elif tile_code == FOREST_CODE:
+            return self._get_score_helper_forest(idx)
+        elif tile_code == MOUNTAIN_CODE:
+            return self._get_score_helper_mountain(idx)
+        elif tile_code == BEACHES_CODE:
+            return BEACHES_REWARD_IF_ON_SHORE if self.on_shore[idx] else 0
+        elif tile_code == BOATS_CODE:
+            return self._get_score_helper_boats(idx)
+        elif tile_code == WAVES_CODE:
+            return self._get_score_helper_waves(idx)
         else:
             return 0
 
-    def _get_score_helper_houses(self, tile: TileData):
-        matches = 0
-        lo_unique_types = list()
-        for near_pos in (tile.adj_info.adj + tile.adj_info.near):
-            tar_tile = self._get_tile_at_position(near_pos)
-            tar_type = tar_tile.type
-            if tar_type not in lo_unique_types and tar_type != TileType.EMPTY and tar_tile.is_valid:
-                matches += 1
-                lo_unique_types.append(tar_type)
-        return HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY * matches
-
-    def _get_score_helper_church(self, tile: TileData):
-        island_tiles = []
-        score = 0
-        for island in self.islands:
-            if tile.pos in island:
-                island_tiles.extend(island)
-        for near_pos in (tile.adj_info.adj + tile.adj_info.near):
-            tar_tile = self._get_tile_at_position(near_pos)
-            tar_type = tar_tile.type
-            if tar_type == TileType.HOUSES and tar_tile.is_valid:
+    def _get_score_helper_houses(self, idx: int):
+        types, valid = self.types, self.valid
+        unique_codes = {types[near_idx] for near_idx in self.adjacency.adj_near[idx] if valid[near_idx]}
+        unique_codes.discard(EMPTY_CODE)
+        return HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY * len(unique_codes)
+
+    def _get_score_helper_church(self, idx: int):
+        types, valid, island_ids = self.types, self.valid, self.island_ids
+        island_id = island_ids[idx]
+        score, houses_nearby_on_island = 0, 0
+        for near_idx in self.adjacency.adj_near[idx]:
+            if types[near_idx] == HOUSES_CODE and valid[near_idx]:
                 score += CHURCHES_REWARD_PER_HOUSES_NEARBY
-                if tar_tile.pos in island_tiles:
-                    island_tiles.remove(tar_tile)
-        for other_tile in island_tiles:
-            if other_tile == TileType.CHURCHES:
+                if island_id and island_ids[near_idx] == island_id:
+                    houses_nearby_on_island += 1
+        if island_id:
+            if self.island_church_counts[island_id] > 1:
                 return 0
-            elif other_tile == TileType.HOUSES:
-                score += CHURCHES_REWARD_PER_OTHER_HOUSES_ON_ISLAND
+            score += CHURCHES_REWARD_PER_OTHER_HOUSES_ON_ISLAND * \
+                (self.island_house_counts[island_id] - houses_nearby_on_island)
         return score
 
-    def _get_score_helper_forest(self, tile: TileData):
+    def _get_score_helper_forest(self, idx: int):
+        types, valid = self.types, self.valid
         matches = 0
-        for adj_pos in tile.adj_info.adj:
-            tar_tile = self._get_tile_at_position(adj_pos)
-            tar_type = tar_tile.type
-            if tar_type == TileType.FOREST and tar_tile.is_valid:
+        for adj_idx in self.adjacency.adj[idx]:
+            if types[adj_idx] == FOREST_CODE and valid[adj_idx]:
                 matches += 1
         return FOREST_REWARD_PER_FOREST_ADJACENT * matches
 
-    def _get_score_helper_mountain(self, tile: TileData):
+    def _get_score_helper_mountain(self, idx: int):
+        types, valid = self.types, self.valid
         matches = 0
-        for near_pos in (tile.adj_info.adj + tile.adj_info.near):
-            tar_tile = self._get_tile_at_position(near_pos)
-            tar_type = tar_tile.type
-            if tar_type == TileType.FOREST and tar_tile.is_valid:
+        for near_idx in self.adjacency.adj_near[idx]:
+            if types[near_idx] == FOREST_CODE and valid[near_idx]:
                 matches += 1
         return MOUNTAIN_REWARD_PER_FOREST_NEARBY * matches
 
-    def _get_score_helper_boats(self, tile: TileData):
-        visited, queue = [], []
-        visited.append(tile.pos)
-        queue.append(tile.pos)
+    def _get_score_helper_boats(self, idx: int):
+        """
+        Scores the number of steps from the boat to the closest island tile, moving across valid tiles only.
+        """
+        distance = self._get_island_distances()[idx]
+        return max(self.row_num, self.col_num) if distance == UNREACHABLE_DISTANCE else distance
+
+    def _is_island_target(self, idx: int) -> bool:
+        """
+        Whether boats measure their distance to this tile: a valid tile on an island or of an on island type.
+        """
+        return bool(self.valid[idx]) and (self.on_island[idx] or self.types[idx] in ON_ISLAND_TILE_CODES)
+
+    def _get_island_distances(self) -> bytearray:
+        """
+        Getter method for the distance to island field, rebuilt with a multi-source BFS if a tile lost its validity
+        since the last call. UNREACHABLE_DISTANCE marks tiles with no path to an island.
+        """
+        if self.distances_dirty:
+            distances = self.island_distances
+            distances[:] = b"\xff" * len(distances)
+            queue = deque()
+            for idx in range(len(distances)):
+                if self._is_island_target(idx):
+                    distances[idx] = 0
+                    queue.append(idx)
+            self._relax_island_distances(queue)
+            self.distances_dirty = False
+        return self.island_distances
+
+    def _relax_island_distances(self, queue: deque):
+        """
+        Helper Method spreading the distances of the queued tiles across valid tiles, lowering any longer distance.
+        """
+        distances, valid, adj = self.island_distances, self.valid, self.adjacency.adj
         while queue:
-            next_pos = queue.pop(0)
-            next_tile = self._get_tile_at_position(next_pos)
-            if next_tile.is_valid:
-                if next_tile.type in ON_ISLAND_TILE_TYPES or next_tile.on_island:
-                    return abs(next_pos.col - tile.pos.col) + abs(next_pos.row - tile.pos.row)
-                for neighbor in next_tile.adj_info.adj:
-                    if neighbor not in visited:
-                        visited.append(neighbor)
-                        queue.append(neighbor)
-        return max(self.row_num, self.col_num)
-
-    def _get_score_helper_waves(self, tile: TileData):
-        for cr_pos in (tile.adj_info.col + tile.adj_info.row):
-            tar_tile = self._get_tile_at_position(cr_pos)
-            tar_type = tar_tile.type
-            if tar_type == TileType.WAVES and tar_tile.is_valid:
+            next_idx = queue.popleft()
+            distance = distances[next_idx] + 1
+            for neighbor in adj[next_idx]:
+                if valid[neighbor] and distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+                    if self.types[neighbor] == BOATS_CODE:
+                        self.dirty_tiles.add(neighbor)
+
+    def _update_island_distances(self, idx: int):
+        """
+        Helper Method keeping the distance field current after the tile changed. A new island target only lowers
+        distances and is spread incrementally; any other change to a valid tile defers to a full rebuild.
+        """
+        if self.distances_dirty:
+            return
+        if self._is_island_target(idx):
+            if self.island_distances[idx] != 0:
+                self.island_distances[idx] = 0
+                self._relax_island_distances(deque([idx]))
+        elif not self.valid[idx]:
+            self._invalidate_island_distances()
+
+    def _invalidate_island_distances(self):
+        """
+        Helper Method deferring the distance field to a full rebuild, marking every boat for rescoring.
+        """
+        self.distances_dirty = True
+        self.dirty_tiles.update(idx for idx, tile_code in enumerate(self.types) if tile_code == BOATS_CODE)
+
+    def _mark_affected_tiles(self, idx: int):
+        """
+        Helper Method marking as dirty the tile and every tile whose score reads it: its adjacent and near tiles,
+        the waves sharing its column or row and the churches on its island.
+        Boats are marked by the distance field as their distance changes.
+        """
+        types = self.types
+        self.dirty_tiles.add(idx)
+        self.dirty_tiles.update(self.adjacency.adj_near[idx])
+        self.dirty_tiles.update(cr_idx for cr_idx in self.adjacency.col_row[idx] if types[cr_idx] == WAVES_CODE)
+        island_id = self.island_ids[idx]
+        if island_id:
+            self.dirty_tiles.update(island_idx for island_idx in self.island_tile_indices[island_id]
+                                    if types[island_idx] == CHURCHES_CODE)
+
+    def _count_island_tiles(self):
+        """
+        Helper Method recounting the valid houses and churches of every island.
+        """
+        self.island_house_counts = [0] * (len(self.islands) + 1)
+        self.island_church_counts = [0] * (len(self.islands) + 1)
+        for idx, island_id in enumerate(self.island_ids):
+            if island_id and self.valid[idx]:
+                if self.types[idx] == HOUSES_CODE:
+                    self.island_house_counts[island_id] += 1
+                elif self.types[idx] == CHURCHES_CODE:
+                    self.island_church_counts[island_id] += 1
+
+    def _get_score_helper_waves(self, idx: int):
+        types, valid = self.types, self.valid
+        for cr_idx in self.adjacency.col_row[idx]:
+            if types[cr_idx] == WAVES_CODE and valid[cr_idx]:
                 return 0
         return WAVES_REWARD_IF_UNIQUE_COLUMN_ROW
 
     def _strict_revalidation_of_all_tiles(self):
-        for tile_pos in self.tile_map.keys():
-            tile = self._get_tile_at_position(tile_pos)
-            tile.validate_tile_type()
+        """
+        Validates Tile Types At the End Of the Game (For a Strict Total Score)
+        """
+        for idx, tile_code in enumerate(self.types):
+            if tile_code in ON_ISLAND_TILE_CODES:
+                self.valid[idx] = self.on_island[idx]
+            elif tile_code in OFF_ISLAND_TILE_CODES:
+                self.valid[idx] = not self.on_island[idx]
+        self._count_island_tiles()
+        self._invalidate_island_distances()
+        self.dirty_tiles.update(range(len(self.types)))
 
-    def add_tile_type_at_position(self, tile_type: TileType, pos: Position):
-        tile = self._get_tile_at_position(pos)
-        if tile.is_occupied:
+    def add_tile_type_at_position(self, tile_type: TileType, pos: Position) -> int:
+        """
+        Adds the given type to the tile at the position
+        as well as Automatic Validation (For Lenient Total Score)
+        :return: The change of the lenient score caused by the placement.
+        """
+        prev_score = self.get_score()
+        idx = self._get_index_at_position(pos)
+        if self.occupied[idx]:
             raise ValueError("Tile Has Been Occupied")
-        tile.add_type(tile_type)
+        if tile_type == TileType.EMPTY:
+            raise ValueError("Placing Empty Tile Type")
+        tile_code = TILE_TYPE_CODES[tile_type]
+        if tile_code in OFF_ISLAND_TILE_CODES and self.on_island[idx]:
+            self.valid[idx] = False
+        self.types[idx] = tile_code
+        self.occupied[idx] = True
+        island_id = self.island_ids[idx]
+        if island_id and self.valid[idx]:
+            if tile_code == HOUSES_CODE:
+                self.island_house_counts[island_id] += 1
+            elif tile_code == CHURCHES_CODE:
+                self.island_church_counts[island_id] += 1
+        self._update_island_distances(idx)
+        self._mark_affected_tiles(idx)
+        return self.get_score() - prev_score
+
+    def is_position_occupied(self, pos: Position) -> bool:
+        return bool(self.occupied[self._get_index_at_position(pos)])
+
+    def get_tile_type_at_position(self, pos: Position) -> TileType:
+        return TILE_TYPES[self.types[self._get_index_at_position(pos)]]
 
     def get_score(self, is_lenient: bool = True):
         if not is_lenient:
             self._strict_revalidation_of_all_tiles()
-        score = 0
-        for tile_pos in self.tile_map.keys():
-            score += self._get_score_at_position(tile_pos)
-        return score
+        if self.dirty_tiles:
+            self._get_island_distances()
+            tile_scores = self.tile_scores
+            for idx in self.dirty_tiles:
+                tile_score = self._get_score_of_tile(idx)
+                self.score += tile_score - tile_scores[idx]
+                tile_scores[idx] = tile_score
+            self.dirty_tiles.clear()
+        return self.score
+
+    def get_score_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Exports the board as arrays of shape (row_num, col_num) for vectorized scoring.
+        :return: The tile type codes (TileType definition order, as in get_tile_array), the validity, island and
+        shore masks, and island ids labelling every island tile with its 1-based index in self.islands.
+        """
+        shape = (self.row_num, self.col_num)
+        types = np.frombuffer(self.types, dtype=np.int8).reshape(shape).copy()
+        valid, on_island, on_shore = (np.frombuffer(arr, dtype=np.uint8).reshape(shape).astype(bool)
+                                      for arr in (self.valid, self.on_island, self.on_shore))
+        island_ids = np.frombuffer(self.island_ids, dtype=np.uint8).reshape(shape).astype(np.int16)
+        return types, valid, on_island, on_shore, island_ids
 
     def add_island(self, lo_island_pos: List[Position]):
-        lo_known_shore_pos = []
-        lo_valid_island_tiles = []
-        for pos in lo_island_pos:
-            tile = self._get_tile_at_position(pos)
-            if tile in lo_valid_island_tiles:
-                raise ValueError("Assigned Island Contains Duplicate Tile Positions")
-            if tile.on_island:
-                raise ValueError("Assigned Island Overlapping with Some Previous Island")
-            is_isolated = True
-            for shore_candidate_pos in tile.adj_info.adj:
-                if shore_candidate_pos not in lo_island_pos and shore_candidate_pos not in lo_known_shore_pos:
-                    if self._get_tile_at_position(shore_candidate_pos).on_island:
-                        raise ValueError("Assigned Island Overlapping with Previous Island")
-                    lo_known_shore_pos.append(shore_candidate_pos)
-                elif shore_candidate_pos in lo_island_pos and is_isolated:
-                    is_isolated = False
-            if is_isolated:
-                raise ValueError("Assigned Island is Not Connected")
-            lo_valid_island_tiles.append(tile)
-        for tile in lo_valid_island_tiles:
-            tile.mark_as_island()
-        for pos in lo_known_shore_pos:
-            self._get_tile_at_position(pos).mark_as_shore()
+        """
+        Draws an island: a connected group of at least two tiles, neither overlapping nor touching a previous island.
+        Its adjacent tiles become its shore. Throws an Exception if the island is not valid.
+        """
+        engine = IslandEngine.get(self.col_num, self.row_num)
+        island_mask = engine.positions_to_mask(lo_island_pos)
+        shore_mask = engine.validate_island(island_mask, self.island_mask)
+        lo_valid_island_idx = [self._get_index_at_position(pos) for pos in lo_island_pos]
+        lo_known_shore_idx = list(iter_mask_indices(shore_mask))
+        island_id = len(self.islands) + 1
+        house_count, church_count = 0, 0
+        for idx in lo_valid_island_idx:
+            self.on_island[idx] = True
+            self.island_ids[idx] = island_id
+            if self.types[idx] in OFF_ISLAND_TILE_CODES:
+                self.valid[idx] = False
+            elif self.valid[idx] and self.types[idx] == HOUSES_CODE:
+                house_count += 1
+            elif self.valid[idx] and self.types[idx] == CHURCHES_CODE:
+                church_count += 1
+        for idx in lo_known_shore_idx:
+            self.on_shore[idx] = True
+            if self.types[idx] in ON_ISLAND_TILE_CODES:
+                self.valid[idx] = False
         self.islands.append(lo_island_pos)
+        self.island_mask |= island_mask
+        self.island_tile_indices.append(tuple(lo_valid_island_idx))
+        self.island_house_counts.append(house_count)
+        self.island_church_counts.append(church_count)
+        for idx in lo_valid_island_idx + lo_known_shore_idx:
+            self._update_island_distances(idx)
+            self._mark_affected_tiles(idx)
+
+    def get_island_candidates(self, max_size: int, cache_dir: Optional[str] = None) \
+            -> Tuple[List[List[Position]], np.ndarray, np.ndarray]:
+        """
+        Every island add_island would accept, of two to max_size tiles, with the change of get_score(is_lenient=False)
+        drawing it causes. Legal placements are filtered from the cached IslandPlacements of the board size and
+        scored as one batch, without touching the board.
+        param cache_dir: Where to keep the placements on disk, as in IslandPlacements.get.
+        :return: The islands, best first, their score changes and their shape ids in get_free_polyominoes(max_size).
+        """
+        placements = IslandPlacements.get(self.col_num, self.row_num, max_size, cache_dir)
+        types, _, on_island, on_shore, island_ids = (arr.reshape(-1) for arr in self.get_score_arrays())
+        is_legal = ~((placements.island_bits | placements.shore_bits) & on_island).any(axis=1)
+        islands, shores = placements.island_bits[is_legal], placements.shore_bits[is_legal]
+        shape = (self.row_num, self.col_num)
+        base_arrays = (types, get_strict_valid(types, on_island), on_island, on_shore, island_ids)
+        base_score = get_batched_scores(*(arr.reshape((1,) + shape) for arr in base_arrays))[0]
+        candidates_on_island = on_island | islands
+        candidates_shape = (len(islands),) + shape
+        scores = get_batched_scores(np.broadcast_to(types, islands.shape).reshape(candidates_shape),
+                                    get_strict_valid(types, candidates_on_island).reshape(candidates_shape),
+                                    candidates_on_island.reshape(candidates_shape),
+                                    (on_shore | shores).reshape(candidates_shape),
+                                    np.where(islands, len(self.islands) + 1, island_ids).reshape(candidates_shape))
+        score_changes = scores - base_score
+        order = np.argsort(-score_changes, kind="stable")
+        lo_islands = [[self.adjacency.positions[idx] for idx in np.flatnonzero(islands[candidate_idx])]
+                      for candidate_idx in order]
+        return lo_islands, score_changes[order], placements.shape_ids[is_legal][order]
 
     def view_board_cli(self):
         for r in range(self.row_num):
             row_str = ""
-            for c in range(self.col_num):
-                row_str += "   " + str(self._get_tile_at_position(Position(c, r)).type.value)
+            for tile_code in self.types[r * self.col_num:(r + 1) * self.col_num]:
+                row_str += "   " + str(TILE_TYPES[tile_code].value)
             print(row_str + "\n")
 
     def get_tile_array(self) -> list[list[int]]:
         lo_rows = []
         for r in range(self.row_num):
-            row = []
-            for c in range(self.col_num):
-                row.append(list(TileType).index(self._get_tile_at_position(Position(c, r)).type))
-            lo_rows.append(row)
+            lo_rows.append(list(self.types[r * self.col_num:(r + 1) * self.col_num]))
         return lo_rows
@@ -0,0 +1,298 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
+import zipfile
+
+import numpy as np
+
+from tinyisland.Tile import Position
+
+ISLAND_CACHE_DIR_VARIABLE = "TINYISLAND_CACHE_DIR"
+ORIENTATIONS = ((1, 0, 0, 1), (-1, 0, 0, 1), (1, 0, 0, -1), (-1, 0, 0, -1),
+                (0, 1, 1, 0), (0, -1, 1, 0), (0, 1, -1, 0), (0, -1, -1, 0))
+
+
+def iter_mask_indices(mask: int) -> Iterator[int]:
+    """
+    Yields the flat tile indices of the set bits of a mask, lowest first.
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+class IslandEngine:
+    """
+    Island geometry on bitsets: a set of tiles is an int whose bit row * col_num + col marks the tile.
+    Growing a mask by one step in every direction is four shifts, so connectivity, shores and candidate islands
+    cost a few big int operations per tile instead of list scans.
+    Computed once per board size and shared by every Board of that size.
+    """
+    _cache = dict()
+
+    def __init__(self, col_num: int, row_num: int):
+        self.col_num = col_num
+        self.row_num = row_num
+        self.board_mask = (1 << col_num * row_num) - 1
+        first_col_mask = sum(1 << r * col_num for r in range(row_num))
+        self.not_first_col_mask = self.board_mask & ~first_col_mask
+        self.not_last_col_mask = self.board_mask & ~(first_col_mask << col_num - 1)
+
+    @classmethod
+    def get(cls, col_num: int, row_num: int) -> "IslandEngine":
+        """
+        Getter method for the shared engine of a board size, generating it on first use.
+        """
+        key = (col_num, row_num)
+        if key not in cls._cache:
+            cls._cache[key] = IslandEngine(col_num, row_num)
+        return cls._cache[key]
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def positions_to_mask(self, lo_pos: List[Position]) -> int:
+        """
+        :return: The mask of the positions. Throws an Exception if a position is outside the board or repeated.
+        """
+        mask = 0
+        for pos in lo_pos:
+            if pos.col < 0 or pos.row < 0 or pos.col >= self.col_num or pos.row >= self.row_num:
+                raise ValueError("Position Outside Board Dimensions")
+            bit = 1 << pos.row * self.col_num + pos.col
+            if mask & bit:
+                raise ValueError("Assigned Island Contains Duplicate Tile Positions")
+            mask |= bit
+        return mask
+
+    def mask_to_positions(self, mask: int) -> List[Position]:
+        return [Position(idx % self.col_num, idx // self.col_num) for idx in iter_mask_indices(mask)]
+
+    def get_adjacent_mask(self, mask: int) -> int:
+        """
+        :return: The tiles adjacent to some tile of the mask, the mask itself excluded.
+        """
+        grown = ((mask & self.not_last_col_mask) << 1) | ((mask & self.not_first_col_mask) >> 1) | \
+            (mask << self.col_num) | (mask >> self.col_num)
+        return grown & self.board_mask & ~mask
+
+    def is_connected(self, mask: int) -> bool:
+        """
+        Flood fills the mask from its lowest tile, one step in every direction at a time.
+        """
+        if not mask:
+            return False
+        reached = mask & -mask
+        while True:
+            grown = reached | (self.get_adjacent_mask(reached) & mask)
+            if grown == reached:
+                return reached == mask
+            reached = grown
+
+    def validate_island(self, island_mask: int, previous_islands_mask: int) -> int:
+        """
+        Checks that the island can be added next to the previous ones: it must be connected, have at least two tiles
+        and neither overlap nor touch a previous island.
+        :return: The shore of the island. Throws an Exception if the island is not valid.
+        """
+        if island_mask & previous_islands_mask:
+            raise ValueError("Assigned Island Overlapping with Some Previous Island")
+        if island_mask & (island_mask - 1) == 0 or not self.is_connected(island_mask):
+            raise ValueError("Assigned Island is Not Connected")
+        shore_mask = self.get_adjacent_mask(island_mask)
+        if shore_mask & previous_islands_mask:
+            raise ValueError("Assigned Island Overlapping with Previous Island")
+        return shore_mask
+
+    def enumerate_islands(self, max_size: int, previous_islands_mask: int = 0) -> Iterator[int]:
+        """
+        Yields the mask of every island that validate_island accepts, of at most max_size tiles, exactly once.
+        Islands are grown from their lowest tile, only ever adding higher tiles that are not next to the island
+        grown so far unless reached through the last added tile, the ESU enumeration of connected subgraphs.
+        """
+        allowed_mask = self.board_mask & ~(previous_islands_mask | self.get_adjacent_mask(previous_islands_mask))
+        for root in iter_mask_indices(allowed_mask):
+            root_bit = 1 << root
+            higher_mask = allowed_mask & ~((root_bit << 1) - 1)
+            yield from self._extend_island(root_bit, 1, self.get_adjacent_mask(root_bit) & higher_mask, higher_mask,
+                                           max_size)
+
+    def _extend_island(self, island_mask: int, island_size: int, extension_mask: int, higher_mask: int,
+                       max_size: int) -> Iterator[int]:
+        """
+        Helper Method of enumerate_islands, yielding the island and every island grown from it.
+        """
+        if island_size > 1:
+            yield island_mask
+        if island_size == max_size:
+            return
+        closed_mask = island_mask | self.get_adjacent_mask(island_mask)
+        while extension_mask:
+            new_bit = extension_mask & -extension_mask
+            extension_mask ^= new_bit
+            new_extension_mask = extension_mask | (self.get_adjacent_mask(new_bit) & higher_mask & ~closed_mask)
+            yield from self._extend_island(island_mask | new_bit, island_size + 1, new_extension_mask, higher_mask,
+                                           max_size)
+
+
+def _normalize_shape(lo_cells) -> Tuple[Tuple[int, int], ...]:
+    """
+    Helper Method translating (column, row) cells to touch both axes, as a sorted tuple.
+    """
+    min_col = min(col for col, _ in lo_cells)
+    min_row = min(row for _, row in lo_cells)
+    return tuple(sorted((col - min_col, row - min_row) for col, row in lo_cells))
+
+
+def get_shape_orientations(shape) -> List[Tuple[Tuple[int, int], ...]]:
+    """
+    :return: The distinct normalized rotations and reflections of a shape, sorted.
+    """
+    return sorted({_normalize_shape([(a * col + b * row, c * col + d * row) for col, row in shape])
+                   for a, b, c, d in ORIENTATIONS})
+
+
+def get_canonical_shape(shape) -> Tuple[Tuple[int, int], ...]:
+    """
+    :return: The smallest of the orientations of a shape, equal for every rotation, reflection and translation of it.
+    """
+    return get_shape_orientations(shape)[0]
+
+
+def get_free_polyominoes(max_size: int) -> List[Tuple[Tuple[int, int], ...]]:
+    """
+    Grows every free polyomino of two to max_size tiles one tile at a time, deduplicated by canonical form.
+    :return: The canonical shapes, by size then in sorted order.
+    """
+    lo_shapes = []
+    current_shapes = {((0, 0),)}
+    for size in range(2, max_size + 1):
+        grown_shapes = set()
+        for shape in current_shapes:
+            cells = set(shape)
+            for col, row in shape:
+                for d_col, d_row in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                    if (col + d_col, row + d_row) not in cells:
+                        grown_shapes.add(get_canonical_shape(cells | {(col + d_col, row + d_row)}))
+        current_shapes = grown_shapes
+        lo_shapes.extend(sorted(current_shapes))
+    return lo_shapes
+
+
+class IslandPlacements:
+    """
+    Every placement of every island shape of two to max_size tiles on an empty board of a size.
+    Row i of island_bits and shore_bits flags the tiles of placement i and of its shore by flat tile index,
+    and shape_ids[i] indexes its shape in get_free_polyominoes(max_size).
+    """
+    _cache: Dict[Tuple[int, int, int], "IslandPlacements"] = dict()
+
+    def __init__(self, col_num: int, row_num: int, max_size: int, island_bits: np.ndarray, shore_bits: np.ndarray,
+                 shape_ids: np.ndarray):
+        self.col_num = col_num
+        self.row_num = row_num
+        self.max_size = max_size
+        self.island_bits = island_bits
+        self.shore_bits = shore_bits
+        self.shape_ids = shape_ids
+
+    @classmethod
+    def get(cls, col_num: int, row_num: int, max_size: int, cache_dir: Optional[str] = None) -> "IslandPlacements":
+        """
+        Getter method for the placements of a board size, computed on first use and kept in memory.
+        param cache_dir: A directory to also keep them on disk in, loaded from there on first use and saved there
+        when missing or not matching the board size. Defaults to the directory in the TINYISLAND_CACHE_DIR
+        environment variable; without either, nothing is written to disk.
+        """
+        key = (col_num, row_num, max_size)
+        if key not in cls._cache:
+            if cache_dir is None:
+                cache_dir = os.environ.get(ISLAND_CACHE_DIR_VARIABLE) or None
+            cache_path = None if cache_dir is None else \
+                os.path.join(cache_dir, "islands_%dx%d_%d.npz" % (col_num, row_num, max_size))
+            placements = None
+            if cache_path is not None and os.path.exists(cache_path):
+                placements = cls._load(cache_path, col_num, row_num, max_size)
+            if placements is None:
+                placements = cls._compute(col_num, row_num, max_size)
+                if cache_path is not None:
+                    placements._save(cache_path)
+            cls._cache[key] = placements
+        return cls._cache[key]
+
+    @staticmethod
+    def _get_placement_count(col_num: int, row_num: int, max_size: int) -> int:
+        """
+        Helper Method counting the placements _compute generates, without generating them.
+        """
+        placement_count = 0
+        for shape in get_free_polyominoes(max_size):
+            for cells in get_shape_orientations(shape):
+                width = max(col for col, _ in cells) + 1
+                height = max(row for _, row in cells) + 1
+                placement_count += max(row_num - height + 1, 0) * max(col_num - width + 1, 0)
+        return placement_count
+
+    @classmethod
+    def _compute(cls, col_num: int, row_num: int, max_size: int) -> "IslandPlacements":
+        engine = IslandEngine.get(col_num, row_num)
+        lo_island_masks, lo_shape_ids = [], []
+        for shape_id, shape in enumerate(get_free_polyominoes(max_size)):
+            for cells in get_shape_orientations(shape):
+                width = max(col for col, _ in cells) + 1
+                height = max(row for _, row in cells) + 1
+                for d_row in range(row_num - height + 1):
+                    for d_col in range(col_num - width + 1):
+                        lo_island_masks.append(sum(1 << (row + d_row) * col_num + col + d_col for col, row in cells))
+                        lo_shape_ids.append(shape_id)
+        return IslandPlacements(col_num, row_num, max_size, cls._masks_to_bits(lo_island_masks, col_num * row_num),
+                                cls._masks_to_bits([engine.get_adjacent_mask(mask) for mask in lo_island_masks],
+                                                   col_num * row_num),
+                                np.array(lo_shape_ids, dtype=np.int32))
+
+    @staticmethod
+    def _masks_to_bits(lo_masks: List[int], tile_count: int) -> np.ndarray:
+        byte_count = (tile_count + 7) // 8
+        packed = np.frombuffer(b"".join(mask.to_bytes(byte_count, "little") for mask in lo_masks), dtype=np.uint8)
+        return np.unpackbits(packed.reshape((len(lo_masks), byte_count)), axis=1, bitorder="little")[:, :tile_count] \
+            .astype(bool)
+
+    @classmethod
+    def _load(cls, cache_path: str, col_num: int, row_num: int, max_size: int) -> Optional["IslandPlacements"]:
+        """
+        Helper Method reading placements saved by _save.
+        :return: The placements, or None if the file cannot be read or does not hold the placements of the board size.
+        """
+        tile_count = col_num * row_num
+        try:
+            with np.load(cache_path) as data:
+                config, island_bits, shore_bits, shape_ids = \
+                    data["config"], data["island_bits"], data["shore_bits"], data["shape_ids"]
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+        placement_shape = (cls._get_placement_count(col_num, row_num, max_size), (tile_count + 7) // 8)
+        if config.tolist() != [col_num, row_num, max_size] or \
+                island_bits.dtype != np.uint8 or island_bits.shape != placement_shape or \
+                shore_bits.dtype != np.uint8 or shore_bits.shape != placement_shape or \
+                shape_ids.dtype.kind != "i" or shape_ids.shape != placement_shape[:1] or \
+                (shape_ids.size and not 0 <= shape_ids.min() <= shape_ids.max() < len(get_free_polyominoes(max_size))):
+            return None
+        return IslandPlacements(col_num, row_num, max_size,
+                                np.unpackbits(island_bits, axis=1, bitorder="little")[:, :tile_count].astype(bool),
+                                np.unpackbits(shore_bits, axis=1, bitorder="little")[:, :tile_count].astype(bool),
+                                shape_ids)
+
+    def _save(self, cache_path: str):
+        """
+        Helper Method writing the placements with bits packed. The file is replaced atomically, so concurrent
+        writers never leave a partial cache behind.
+        """
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_path, "wb") as tmp_file:
+            np.savez(tmp_file,
+                     island_bits=np.packbits(self.island_bits, axis=1, bitorder="little"),
+                     shore_bits=np.packbits(self.shore_bits, axis=1, bitorder="little"),
+                     shape_ids=self.shape_ids,
+                     config=np.array((self.col_num, self.row_num, self.max_size), dtype=np.int64))
+        os.replace(tmp_path, cache_path)
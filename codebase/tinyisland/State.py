@@ -1,6 +1,7 @@
+import itertools
 import math
 from enum import Enum
-from typing import Tuple, List
+from typing import Iterator, Tuple, List, Optional, Sequence
 from tinyisland.Board import Board
 import random as rand
 
@@ -36,32 +37,138 @@ class Choice:
                     rlist.append(Position(self.range_idx, row_idx))
                 return rlist
         elif self.tile_range == TileRange.CLUSTER:
-            if col_num != row_num:
+            if col_num != row_num or math.isqrt(col_num) ** 2 != col_num:
                 raise ValueError("Invalid Board Dimensions, Does not support Cluster")
-            start_x = int(self.range_idx % col_num)
-            start_y = int(self.range_idx / row_num)
-            for y in range(col_num):
-                for x in range(col_num):
+            cluster_size = math.isqrt(col_num)
+            if self.range_idx >= col_num:
+                raise ValueError("Invalid Cluster Index")
+            start_x = int(self.range_idx / cluster_size) * cluster_size
+            start_y = int(self.range_idx % cluster_size) * cluster_size
+            for x in range(cluster_size):
+                for y in range(cluster_size):
                     rlist.append(Position(start_x + x, start_y + y))
             return rlist
 
 
+def get_range_count(tile_range: TileRange, col_num: int = 9, row_num: int = 9) -> int:
+    """
+    :return: The number of ranges of the kind on the board: columns, rows or clusters.
+    """
+    if tile_range == TileRange.COLUMN:
+        return col_num
+    elif tile_range == TileRange.ROW:
+        return row_num
+    else:
+        return col_num
+
+
+def iter_choice_draws(seed_num: Optional[int], lo_range_counts: Sequence[int], draw_num: int) \
+        -> Iterator[Tuple[int, int, int]]:
+    """
+    Draws the choices of a game from the seed, turn by turn and choice by choice. The env and State both draw
+    through this, so a seed gives the same game in both.
+    param lo_range_counts: The number of ranges of every kind offered, in TileRange order.
+    :return: For every choice, the index of its range kind in lo_range_counts, its range index and its tile type
+    index in TileType.
+    """
+    rng = rand.Random(seed_num)
+    kind_num, type_num = len(lo_range_counts), len(TileType)
+    for _ in range(draw_num):
+        range_kind = rng.randrange(kind_num)
+        yield range_kind, rng.randrange(lo_range_counts[range_kind]), rng.randrange(type_num)
+
+
+def compute_choices_based_on_seed(seed_num: Optional[int], col_num: int = 9, row_num: int = 9, choice_num: int = 2,
+                                  turn_limit: int = 30) -> List[List[Choice]]:
+    """
+    :return: The choices of every turn, drawn by iter_choice_draws.
+    """
+    lo_ranges = list(TileRange) if col_num == row_num and math.isqrt(col_num) ** 2 == col_num \
+        else [TileRange.COLUMN, TileRange.ROW]
+    lo_tile_types = list(TileType)
+    draws = iter_choice_draws(seed_num, [get_range_count(r_range, col_num, row_num) for r_range in lo_ranges],
+                              turn_limit * choice_num)
+    return [[Choice(lo_tile_types[type_idx], lo_ranges[range_kind], range_idx)
+             for range_kind, range_idx, type_idx in itertools.islice(draws, choice_num)]
+            for _ in range(turn_limit)]
+
 
 class State:
-    def __init__(self, seed_num: int = rand.randint, col_num: int = 9, row_num: int = 9,
+    """
+    A full game: the board, the turn counter and the choices offered on every turn, drawn from the seed.
+    Every turn the player places the tile type of one of the choices on a vacant position of its range;
+    the game ends after turn_limit turns, or as soon as a turn comes on which no choice can be placed, as in the env.
+    """
+
+    def __init__(self, seed_num: Optional[int] = None, col_num: int = 9, row_num: int = 9,
                  choice_num: int = 2, turn_limit: int = 30):
         self.board = Board(col_num, row_num)
+        self.col_num = col_num
+        self.row_num = row_num
         self.turn_limit = turn_limit
         self.turns_passed = 0
         self.choice_num = choice_num
         self.choices = self.compute_all_choices(seed_num)
+        self.choice_positions = [[tuple(choice.get_all_valid_positions(col_num, row_num)) for choice in choices_in_turn]
+                                 for choices_in_turn in self.choices]
+
+    def compute_all_choices(self, seed_num: Optional[int]) -> List[List[Choice]]:
+        return compute_choices_based_on_seed(seed_num, self.col_num, self.row_num, self.choice_num, self.turn_limit)
+
+    def clone(self) -> "State":
+        """
+        :return: An independent copy of the game. The choices never change, so they are shared.
+        """
+        other = State.__new__(State)
+        other.board = self.board.clone()
+        other.col_num = self.col_num
+        other.row_num = self.row_num
+        other.turn_limit = self.turn_limit
+        other.turns_passed = self.turns_passed
+        other.choice_num = self.choice_num
+        other.choices = self.choices
+        other.choice_positions = self.choice_positions
+        return other
+
+    def get_legal_moves(self) -> List[Tuple[int, Position]]:
+        """
+        :return: Every (choice index, position) that can be played this turn, empty once the game is over.
+        """
+        if self.turns_passed >= self.turn_limit:
+            return []
+        lo_moves = []
+        for choice_idx, choice in enumerate(self.choices[self.turns_passed]):
+            if choice.tile_type == TileType.EMPTY:
+                continue
+            for pos in self.choice_positions[self.turns_passed][choice_idx]:
+                if not self.board.is_position_occupied(pos):
+                    lo_moves.append((choice_idx, pos))
+        return lo_moves
+
+    def is_terminal(self) -> bool:
+        """
+        :return: True once turn_limit turns are played, or when no choice of the current turn can be placed.
+        """
+        if self.turns_passed >= self.turn_limit:
+            return True
+        return not any(choice.tile_type != TileType.EMPTY and
+                       any(not self.board.is_position_occupied(pos) for pos in positions)
+                       for choice, positions in zip(self.choices[self.turns_passed],
+                                                    self.choice_positions[self.turns_passed]))
 
-    def compute_all_choices(self, seed_num: int) -> List[List[Choice]]:
-        rand.seed(seed_num)
-        choices_in_game = []
-        for turn_num in range(self.turn_limit):
-            choices_in_turn = []
-            for choice_idx in range(self.choice_num):
-                r_type = list(TileType)[rand.randrange(len(TileType))]
+    def apply_move(self, choice_idx: int, pos: Position) -> int:
+        """
+        Plays the move and passes the turn.
+        :return: The change of the lenient score. Throws an Exception if the move is not legal.
+        """
+        if self.turns_passed >= self.turn_limit:
+            raise ValueError("Game Is Over")
+        choice = self.choices[self.turns_passed][choice_idx]
+        if pos not in self.choice_positions[self.turns_passed][choice_idx]:
+            raise ValueError("Target Position Not in Choice")
+        delta = self.board.add_tile_type_at_position(choice.tile_type, pos)
+        self.turns_passed += 1
+        return delta
 
-                choices_in_turn.append(Choice())
+    def get_score(self) -> int:
+        return self.board.get_score()
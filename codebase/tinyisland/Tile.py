@@ -1,5 +1,4 @@
 from enum import Enum
-from typing import List
 
 
 class TileType(Enum):
@@ -20,71 +19,77 @@ OFF_ISLAND_TILE_TYPES = ON_SHORE_TILE_TYPES + OFF_SHORE_TILE_TYPES
 
 
 class Position:
-    def __init__(self, column_index: int, row_index: int):
-        self.col = column_index
-        self.row = row_index
+    """
+    An immutable column and row on the board. Positions are interned: Position(c, r) always returns the same
+    instance, so equality, hashing and dict or set lookups are identity based, O(1) and allocation free.
+    """
+    __slots__ = ("col", "row")
+    _interned = dict()
+
+    def __new__(cls, column_index: int, row_index: int):
+        pos = cls._interned.get((column_index, row_index))
+        if pos is None:
+            pos = object.__new__(cls)
+            object.__setattr__(pos, "col", column_index)
+            object.__setattr__(pos, "row", row_index)
+            cls._interned[(column_index, row_index)] = pos
+        return pos
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is Immutable")
+
+    def __reduce__(self):
+        return Position, (self.col, self.row)
+
+    def __copy__(self):
+        return self
 
+    def __deepcopy__(self, memo):
+        return self
 
-class AdjacencyInfo:
-    def __int__(self, adjacent_pos: List[Position], near_pos: List[Position],
-                col_pos: List[Position], row_pos: List[Position]):
-        self.adj = adjacent_pos
-        self.near = near_pos
-        self.col = col_pos
-        self.row = row_pos
+    def __repr__(self):
+        return "Position(" + str(self.col) + ", " + str(self.row) + ")"
 
 
-class TileData:
+class AdjacencyTable:
     """
-    A tile contains position, and a tuple of two list of ints representing touching tiles and nearby tiles.
+    Flat tile indices (row * col_num + col) of the adjacent, near, same column and same row tiles of every tile.
+    Computed once per board size and shared by every Board of that size.
     """
+    _cache = dict()
 
-    def __init__(self, position_on_board: Position, adjacency_info: AdjacencyInfo, is_tile_occupied: bool = False,
-                 is_tile_on_island: bool = False, is_tile_on_shore: bool = False,
-                 type_of_terrain: TileType = TileType.EMPTY, is_valid: bool = True):
-        self.pos = position_on_board
-        self.adj_info = adjacency_info
-        self.is_occupied = is_tile_occupied
-        self.on_island = is_tile_on_island
-        self.on_shore = is_tile_on_shore
-        self.type = type_of_terrain
-        self.is_valid = is_valid
-
-    def add_type(self, tar: TileType):
-        """
-        Adds the given type to the current tile data
-        as well as Automatic Validation (For Lenient Total Score)
-        """
-        if tar == TileType.EMPTY:
-            raise ValueError("Placing Empty TileData Type")
-        elif tar in OFF_ISLAND_TILE_TYPES and self.on_island:
-            self.is_valid = False
-        self.type = tar
-        self.is_occupied = True
-
-    def mark_as_island(self):
-        """
-        Method Used To Update The Tile Type when marked as island
-        as well as Automatic Validation (For Lenient Total Score)
-        """
-        self.on_island = True
-        if self.type in OFF_ISLAND_TILE_TYPES:
-            self.is_valid = False
+    def __init__(self, col_num: int, row_num: int):
+        self.col_num = col_num
+        self.row_num = row_num
+        self.positions = tuple(Position(c, r) for r in range(row_num) for c in range(col_num))
+        adj, near, col, row = [], [], [], []
+        for pos in self.positions:
+            tile_adj, tile_near = [], []
+            for d_col, d_row, lo_idx in ((1, 0, tile_adj), (-1, 0, tile_adj), (0, 1, tile_adj), (0, -1, tile_adj),
+                                         (1, 1, tile_near), (1, -1, tile_near), (-1, 1, tile_near),
+                                         (-1, -1, tile_near)):
+                if 0 <= pos.col + d_col < col_num and 0 <= pos.row + d_row < row_num:
+                    lo_idx.append((pos.row + d_row) * col_num + pos.col + d_col)
+            adj.append(tuple(tile_adj))
+            near.append(tuple(tile_near))
+            col.append(tuple(r * col_num + pos.col for r in range(row_num) if r != pos.row))
+            row.append(tuple(pos.row * col_num + c for c in range(col_num) if c != pos.col))
+        self.adj = tuple(adj)
+        self.near = tuple(near)
+        self.col = tuple(col)
+        self.row = tuple(row)
+        self.adj_near = tuple(a + n for a, n in zip(self.adj, self.near))
+        self.col_row = tuple(c + r for c, r in zip(self.col, self.row))
 
-    def mark_as_shore(self):
+    @classmethod
+    def get(cls, col_num: int, row_num: int) -> "AdjacencyTable":
         """
-        Method Used To Update Tile Type when marked as shore
-        as well as Automatic Validation (For Lenient Total Score)
+        Getter method for the shared table of a board size, generating it on first use.
         """
-        self.on_shore = True
-        if self.type in ON_ISLAND_TILE_TYPES:
-            self.is_valid = False
+        key = (col_num, row_num)
+        if key not in cls._cache:
+            cls._cache[key] = AdjacencyTable(col_num, row_num)
+        return cls._cache[key]
 
-    def validate_tile_type(self):
-        """
-        Method Used To Validate Tile Types At the End Of the Game (For a Strict Total Score)
-        """
-        if self.type in ON_ISLAND_TILE_TYPES:
-            self.is_valid = self.on_island
-        elif self.type in OFF_ISLAND_TILE_TYPES:
-            self.is_valid = not self.on_island
+    def __deepcopy__(self, memo):
+        return self
@@ -0,0 +1,418 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import math
+import multiprocessing
+import random as rand
+import time
+
+import numpy as np
+
+from tinyisland.Board import Board, TILE_TYPES, EMPTY_CODE, OFF_ISLAND_TILE_CODES, get_batched_scores
+from tinyisland.Tile import Position
+from tinyisland.env import TinyIslandsWithoutIslands, EnvSnapshot, TURN_LIMIT, CHOICE_NUM, BOARD_SIZE, \
+    INVALID_ACTION_REWARD, TARGET_INDEX_TABLE
+
+Action = Tuple[int, Position]
+
+
+def get_legal_actions(board: Board, turn_choices: dict) -> List[Action]:
+    """
+    :return: Every allowed (choice index, position) of the turn, one per distinct placement: choices offering the same
+    tile type on overlapping targets place the same tile, so only the first of them is kept.
+    """
+    lo_actions, seen = [], set()
+    for choice_idx in range(CHOICE_NUM):
+        choice = turn_choices["choice" + str(choice_idx)]
+        if choice["tile_type"] == EMPTY_CODE:
+            continue
+        for pos in choice["target_positions"]:
+            key = (choice["tile_type"], pos)
+            if key not in seen and not board.is_position_occupied(pos):
+                seen.add(key)
+                lo_actions.append((choice_idx, pos))
+    return lo_actions
+
+
+def apply_action(board: Board, turn_choices: dict, action: Action) -> int:
+    """
+    Places the tile type of the chosen choice on the board.
+    :return: The reward of the placement, as TinyIslandsWithoutIslands.step returns it.
+    """
+    choice_idx, pos = action
+    return board.add_tile_type_at_position(TILE_TYPES[turn_choices["choice" + str(choice_idx)]["tile_type"]], pos)
+
+
+def to_env_action(action: Action) -> dict:
+    choice_idx, pos = action
+    return {"choice": choice_idx, "target_position": np.array((pos.col, pos.row))}
+
+
+def random_rollout(board: Board, choices: list, turns_passed: int, rng: rand.Random) -> int:
+    """
+    Finishes the game on the board with uniformly random placements. The game ends after the last turn, or on the
+    first turn where nothing can be placed, as the env has no action for it.
+    :return: The final score.
+    """
+    while turns_passed < TURN_LIMIT:
+        lo_actions = get_legal_actions(board, choices[turns_passed])
+        if not lo_actions:
+            break
+        apply_action(board, choices[turns_passed], lo_actions[rng.randrange(len(lo_actions))])
+        turns_passed += 1
+    return board.get_score()
+
+
+class SearchNode:
+    """
+    A node of the MCTS tree: the visits and the summed final scores through it, its expanded children by action and,
+    once reached, the actions still to expand in random order.
+    """
+    __slots__ = ("visit_count", "score_sum", "children", "untried_actions")
+
+    def __init__(self):
+        self.visit_count = 0
+        self.score_sum = 0
+        self.children: Dict[Action, "SearchNode"] = dict()
+        self.untried_actions: Optional[List[Action]] = None
+
+
+def run_search(snapshot: EnvSnapshot, simulation_num: int, exploration: float,
+               widening: Optional[Tuple[float, float]], seed: int) -> Dict[Action, Tuple[int, int]]:
+    """
+    Runs UCT from the snapshot: every simulation descends the tree on a copy of the board, expands one action and
+    plays a random rollout. Children are picked by mean final score, normalized to [0, 1] by the lowest and highest
+    scores seen so far, plus exploration * sqrt(ln(parent visits) / child visits).
+    param widening: (constant, exponent) of progressive widening: a node expands a new action only while it has fewer
+    than constant * visits ** exponent children, so wide turns are searched deep before they are searched broad.
+    None expands every action before selecting any.
+    :return: The (visits, summed final scores) of every expanded action of the root.
+    """
+    rng = rand.Random(seed)
+    root = SearchNode()
+    lowest_score, highest_score = math.inf, -math.inf
+    for _ in range(simulation_num):
+        board, turns_passed = snapshot.board.clone(), snapshot.turns_passed
+        node, lo_path = root, [root]
+        while turns_passed < TURN_LIMIT:
+            turn_choices = snapshot.choices[turns_passed]
+            if node.untried_actions is None:
+                node.untried_actions = get_legal_actions(board, turn_choices)
+                rng.shuffle(node.untried_actions)
+            if node.untried_actions and (not node.children or widening is None or
+                                         len(node.children) < widening[0] * node.visit_count ** widening[1]):
+                action = node.untried_actions.pop()
+                node.children[action] = SearchNode()
+            elif node.children:
+                score_range = max(highest_score - lowest_score, 1)
+                log_visits = math.log(node.visit_count)
+                action = max(node.children, key=lambda child_action: (
+                    (node.children[child_action].score_sum / node.children[child_action].visit_count - lowest_score) /
+                    score_range + exploration * math.sqrt(log_visits / node.children[child_action].visit_count)))
+            else:
+                break
+            apply_action(board, turn_choices, action)
+            turns_passed += 1
+            node = node.children[action]
+            lo_path.append(node)
+            if node.visit_count == 0:
+                break
+        score = random_rollout(board, snapshot.choices, turns_passed, rng)
+        lowest_score, highest_score = min(lowest_score, score), max(highest_score, score)
+        for path_node in lo_path:
+            path_node.visit_count += 1
+            path_node.score_sum += score
+    return {action: (child.visit_count, child.score_sum) for action, child in root.children.items()}
+
+
+def _run_search_task(task: tuple) -> Dict[Action, Tuple[int, int]]:
+    return run_search(*task)
+
+
+class MCTSAgent:
+    """
+    Monte Carlo Tree Search over TinyIslandsWithoutIslands, searching from env.get_state() on copies of the board.
+    With process_num above one, the root is parallelized: every process searches its own tree with its own seed and
+    an equal share of the simulations, and the root statistics are summed before picking the most visited action.
+    The processes are started on the first move and kept until close.
+    """
+
+    def __init__(self, simulation_num: int = 1000, exploration: float = math.sqrt(2),
+                 widening_constant: Optional[float] = None, widening_exponent: float = 0.5, process_num: int = 1,
+                 seed: Optional[int] = None):
+        if simulation_num < 1 or process_num < 1:
+            raise ValueError("Simulation and Process Numbers Must Be Positive")
+        self.simulation_num = simulation_num
+        self.exploration = exploration
+        self.widening = None if widening_constant is None else (widening_constant, widening_exponent)
+        self.process_num = process_num
+        self.rng = rand.Random(seed)
+        self.pool = None
+        self.lo_move_seconds = []
+        self.simulations_run = 0
+
+    def act(self, env: TinyIslandsWithoutIslands) -> dict:
+        """
+        :return: The action to play on the env, in the env's action format. Throws an Exception if nothing can be
+        placed on the current turn.
+        """
+        start_time = time.time()
+        snapshot = env.get_state()
+        if snapshot.turns_passed >= TURN_LIMIT or \
+                not get_legal_actions(snapshot.board, snapshot.choices[snapshot.turns_passed]):
+            raise ValueError("No Allowed Action On This Turn")
+        simulations_per_process = -(-self.simulation_num // self.process_num)
+        lo_tasks = [(snapshot, simulations_per_process, self.exploration, self.widening, self.rng.randrange(2 ** 32))
+                    for _ in range(self.process_num)]
+        if self.process_num == 1:
+            lo_root_stats = [run_search(*lo_tasks[0])]
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.process_num)
+            lo_root_stats = self.pool.map(_run_search_task, lo_tasks)
+        merged_stats = dict()
+        for root_stats in lo_root_stats:
+            for action, (visit_count, score_sum) in root_stats.items():
+                merged_visits, merged_sum = merged_stats.get(action, (0, 0))
+                merged_stats[action] = (merged_visits + visit_count, merged_sum + score_sum)
+        best_action = max(merged_stats, key=lambda action: (merged_stats[action][0],
+                                                            merged_stats[action][1] / merged_stats[action][0]))
+        self.lo_move_seconds.append(time.time() - start_time)
+        self.simulations_run += simulations_per_process * self.process_num
+        return to_env_action(best_action)
+
+    def reseed(self, seed: Optional[int]):
+        self.rng = rand.Random(seed)
+
+    def get_stats(self) -> dict:
+        """
+        :return: The number of moves played, the mean and highest seconds per move and the simulations per second.
+        """
+        total_seconds = sum(self.lo_move_seconds)
+        return {"moves": len(self.lo_move_seconds),
+                "mean_move_seconds": total_seconds / len(self.lo_move_seconds) if self.lo_move_seconds else 0.0,
+                "max_move_seconds": max(self.lo_move_seconds, default=0.0),
+                "simulations_per_second": self.simulations_run / total_seconds if total_seconds else 0.0}
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+def _get_best_env_action(env: TinyIslandsWithoutIslands, rewards: np.ndarray) -> dict:
+    """
+    Helper Method turning the highest of the (number of choices, 9) rewards over the current turn's target positions
+    into an env action, the first one on ties.
+    """
+    choice_idx, pos_idx = np.unravel_index(int(rewards.argmax()), rewards.shape)
+    pos = env.choices[env.turns_passed]["choice" + str(choice_idx)]["target_positions"][pos_idx]
+    return to_env_action((int(choice_idx), pos))
+
+
+def get_lookahead_rewards(env: TinyIslandsWithoutIslands, depth: int) -> np.ndarray:
+    """
+    Rewards of every placement offered on the current turn, followed by the best placements of the next depth - 1
+    turns, searched exhaustively. Every level of the search tree is scored as one batch of candidate boards, so the
+    cost grows as 18 ** depth boards; a depth of 1 equals env.get_candidate_rewards().
+    Past the current turn, choices placing the same tile type on the same tile are expanded once. A line stops early
+    on the last turn or on a turn where nothing can be placed, where the game ends, and keeps its score from then on.
+    :return: Array of shape (number of choices, 9): the highest total reward reachable after placing each choice at
+    each of its target positions, INVALID_ACTION_REWARD where the placement is not allowed.
+    """
+    types, valid, on_island, on_shore, island_ids = env.board.get_score_arrays()
+    tile_count = BOARD_SIZE * BOARD_SIZE
+    candidate_count = CHOICE_NUM * BOARD_SIZE
+    frontier_types, frontier_valid = types.reshape((1, tile_count)), valid.reshape((1, tile_count))
+    frontier_scores = np.array([env.board.get_score()], dtype=np.int64)
+    frontier_origins = np.array([-1])
+    lo_ended_scores, lo_ended_origins = [], []
+    flat_on_island = on_island.reshape(tile_count)
+    for turn_num in range(env.turns_passed, min(env.turns_passed + depth, TURN_LIMIT)):
+        turn_choices = [env.choices[turn_num]["choice" + str(choice_idx)] for choice_idx in range(CHOICE_NUM)]
+        candidate_codes = np.repeat([choice["tile_type"] for choice in turn_choices], BOARD_SIZE)
+        candidate_tiles = TARGET_INDEX_TABLE[[choice["target_group"] for choice in turn_choices]].reshape(-1)
+        is_first = np.array([turn_num == env.turns_passed or
+                             (code, tile) not in set(zip(candidate_codes[:idx], candidate_tiles[:idx]))
+                             for idx, (code, tile) in enumerate(zip(candidate_codes, candidate_tiles))])
+        is_allowed = (frontier_types[:, candidate_tiles] == EMPTY_CODE) & (candidate_codes != EMPTY_CODE) & is_first
+        parent_idx, candidate_idx = np.nonzero(is_allowed)
+        if not parent_idx.size:
+            break
+        is_stuck = ~is_allowed.any(axis=1)
+        lo_ended_scores.append(frontier_scores[is_stuck])
+        lo_ended_origins.append(frontier_origins[is_stuck])
+        child_types, child_valid = frontier_types[parent_idx], frontier_valid[parent_idx]
+        child_tiles = candidate_tiles[candidate_idx]
+        child_rows = np.arange(parent_idx.size)
+        child_types[child_rows, child_tiles] = candidate_codes[candidate_idx]
+        child_valid[child_rows, child_tiles] = \
+            ~(np.isin(candidate_codes[candidate_idx], OFF_ISLAND_TILE_CODES) & flat_on_island[child_tiles])
+        children_shape = (parent_idx.size, BOARD_SIZE, BOARD_SIZE)
+        child_scores = get_batched_scores(child_types.reshape(children_shape), child_valid.reshape(children_shape),
+                                          np.broadcast_to(on_island, children_shape),
+                                          np.broadcast_to(on_shore, children_shape),
+                                          np.broadcast_to(island_ids, children_shape))
+        frontier_origins = candidate_idx if turn_num == env.turns_passed else frontier_origins[parent_idx]
+        frontier_types, frontier_valid, frontier_scores = child_types, child_valid, child_scores
+    final_scores = np.concatenate(lo_ended_scores + [frontier_scores])
+    final_origins = np.concatenate(lo_ended_origins + [frontier_origins])
+    best_scores = np.full(candidate_count, np.iinfo(np.int64).min, dtype=np.int64)
+    is_placed = final_origins >= 0
+    np.maximum.at(best_scores, final_origins[is_placed], final_scores[is_placed])
+    rewards = np.where(best_scores > np.iinfo(np.int64).min, best_scores - env.board.get_score(), INVALID_ACTION_REWARD)
+    return rewards.reshape((CHOICE_NUM, BOARD_SIZE))
+
+
+class RandomAgent:
+    """
+    Places a uniformly random allowed placement of the current turn.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    def reseed(self, seed: Optional[int]):
+        self.rng = np.random.default_rng(seed)
+
+    def act(self, env: TinyIslandsWithoutIslands) -> dict:
+        choice_idx, row, col = np.unravel_index(int(self.rng.choice(np.flatnonzero(env.get_action_mask()))),
+                                                env.get_action_mask().shape)
+        return to_env_action((int(choice_idx), Position(int(col), int(row))))
+
+
+class GreedyAgent:
+    """
+    Places the allowed placement of the current turn with the highest immediate reward, scored in one batch.
+    """
+
+    def act(self, env: TinyIslandsWithoutIslands) -> dict:
+        return _get_best_env_action(env, env.get_candidate_rewards())
+
+
+class LookaheadAgent:
+    """
+    Places the allowed placement of the current turn that leads to the highest total reward over the next depth
+    turns, knowing the choices those turns offer. See get_lookahead_rewards.
+    """
+
+    def __init__(self, depth: int = 2):
+        if depth < 1:
+            raise ValueError("Lookahead Depth Must Be Positive")
+        self.depth = depth
+
+    def act(self, env: TinyIslandsWithoutIslands) -> dict:
+        return _get_best_env_action(env, get_lookahead_rewards(env, self.depth))
+
+
+def play_game(agent, seed: Optional[int] = None) -> int:
+    """
+    Plays one game of TinyIslandsWithoutIslands with the agent, until the last turn or a turn where nothing can be
+    placed.
+    :return: The final score.
+    """
+    env = TinyIslandsWithoutIslands()
+    env.reset(seed=seed)
+    terminated = False
+    while not terminated and env.get_action_mask().any():
+        _, terminated, _, done, _ = env.step(agent.act(env))
+        if done:
+            raise ValueError("Agent Played an Invalid Action")
+    return env.board.get_score()
+
+
+def _get_agent_stats(agent) -> Optional[dict]:
+    """
+    Helper Method reading the move statistics of agents keeping them, as MCTSAgent does.
+    """
+    return agent.get_stats() if hasattr(agent, "get_stats") else None
+
+
+def _play_seeded_game(agent, seed_num: int) -> int:
+    """
+    Helper Method playing the game of the seed with the agent re-seeded from it, for agents drawing random numbers,
+    so every game is an independent sample whichever copy of the agent plays it.
+    """
+    if hasattr(agent, "reseed"):
+        agent.reseed(seed_num)
+    return play_game(agent, seed_num)
+
+
+def _play_game_task(task: tuple) -> Tuple[int, Optional[dict]]:
+    agent, seed_num = task
+    return _play_seeded_game(agent, seed_num), _get_agent_stats(agent)
+
+
+def _merge_agent_stats(lo_stats: List[dict]) -> dict:
+    """
+    Helper Method merging the get_stats of several copies of an MCTSAgent into the stats of all their moves.
+    """
+    move_num = sum(stats["moves"] for stats in lo_stats)
+    lo_total_seconds = [stats["mean_move_seconds"] * stats["moves"] for stats in lo_stats]
+    total_seconds = sum(lo_total_seconds)
+    simulations_run = sum(stats["simulations_per_second"] * seconds
+                          for stats, seconds in zip(lo_stats, lo_total_seconds))
+    return {"moves": move_num,
+            "mean_move_seconds": total_seconds / move_num if move_num else 0.0,
+            "max_move_seconds": max((stats["max_move_seconds"] for stats in lo_stats), default=0.0),
+            "simulations_per_second": simulations_run / total_seconds if total_seconds else 0.0}
+
+
+def evaluate_agent(agent, seeds: Iterable[int], process_num: Optional[int] = None) -> dict:
+    """
+    Plays one game per seed across a process pool, every game with its own copy of the agent, re-seeded from the
+    game seed.
+    An agent with process_num above one already searches every move in its own processes, which pool workers cannot
+    start, so its games are played one after another in this process instead.
+    :return: The scores in seed order, their mean, the games played per second and, for agents with get_stats,
+    the stats of all their moves, else None.
+    """
+    start_time = time.time()
+    if getattr(agent, "process_num", 1) > 1:
+        lo_scores = [_play_seeded_game(agent, seed_num) for seed_num in seeds]
+        agent_stats = _get_agent_stats(agent)
+    else:
+        lo_tasks = [(agent, seed_num) for seed_num in seeds]
+        with multiprocessing.Pool(process_num) as pool:
+            lo_results = pool.map(_play_game_task, lo_tasks)
+        lo_scores = [score for score, _ in lo_results]
+        lo_stats = [stats for _, stats in lo_results if stats is not None]
+        agent_stats = _merge_agent_stats(lo_stats) if lo_stats else None
+    seconds = time.time() - start_time
+    return {"scores": lo_scores,
+            "mean_score": sum(lo_scores) / len(lo_scores) if lo_scores else 0.0,
+            "games_per_second": len(lo_scores) / seconds,
+            "agent_stats": agent_stats}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark a tinyisland agent over a range of seeds.")
+    parser.add_argument("agent", choices=("random", "greedy", "lookahead", "mcts"))
+    parser.add_argument("--games", type=int, default=64, help="Number of games, seeded 0 to games - 1.")
+    parser.add_argument("--depth", type=int, default=2, help="Depth of the lookahead agent.")
+    parser.add_argument("--simulations", type=int, default=200, help="Simulations per move of the MCTS agent.")
+    parser.add_argument("--widening", type=float, default=None, help="Progressive widening constant of MCTS.")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Processes playing the games, or searching every move of the MCTS agent if above one.")
+    args = parser.parse_args()
+    if args.agent == "random":
+        benchmark_agent = RandomAgent(seed=0)
+    elif args.agent == "greedy":
+        benchmark_agent = GreedyAgent()
+    elif args.agent == "lookahead":
+        benchmark_agent = LookaheadAgent(args.depth)
+    else:
+        benchmark_agent = MCTSAgent(args.simulations, widening_constant=args.widening,
+                                    process_num=args.processes or 1, seed=0)
+    print("-------------------------------------------------")
+    print("Benchmarking " + args.agent + " Over " + str(args.games) + " Games")
+    result = evaluate_agent(benchmark_agent, range(args.games), args.processes)
+    print("Mean Score: " + str(result["mean_score"]))
+    print("Games Per Second: " + str(result["games_per_second"]))
+    if result["agent_stats"] is not None:
+        print("Mean Seconds Per Move: " + str(result["agent_stats"]["mean_move_seconds"]) +
+              ", Max Seconds Per Move: " + str(result["agent_stats"]["max_move_seconds"]))
+        print("Simulations Per Second: " + str(result["agent_stats"]["simulations_per_second"]))
+    if args.agent == "mcts":
+        benchmark_agent.close()
+    print("-------------------------------------------------")
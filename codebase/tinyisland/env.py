@@ -1,262 +1,123 @@
 from typing import Optional
 
 from gym import Env
-import random as rand
+import copy
 
 from gym.core import ActType
-from gym.spaces import Dict, Tuple, Box, Discrete
+from gym.spaces import Dict, Box, Discrete
 
-from tinyisland.Board import Board
-from tinyisland.Tile import TileType, Position
+import numpy as np
+
+from tinyisland.Board import Board, get_batched_scores, TILE_TYPES, TILE_TYPE_CODES
+from tinyisland.State import iter_choice_draws
+from tinyisland.Tile import TileType, Position, OFF_ISLAND_TILE_TYPES
+
+INVALID_ACTION_REWARD = -500
+TURN_LIMIT = 27
+
+
+BOARD_SIZE = 9
+CHOICE_NUM = 2
+CLUSTER_KIND_NUM = 3
+
+
+def _build_target_position_groups() -> tuple:
+    """
+    Helper Method listing the target positions a choice can offer, computed once at import.
+    :return: Indexed by cluster kind then cluster number: the column, the row or the 3x3 cluster, in that order.
+    """
+    columns = tuple(tuple(Position(col, row) for row in range(BOARD_SIZE)) for col in range(BOARD_SIZE))
+    rows = tuple(tuple(Position(col, row) for col in range(BOARD_SIZE)) for row in range(BOARD_SIZE))
+    clusters = tuple(tuple(Position(3 * (cluster // 3) + d_col, 3 * (cluster % 3) + d_row)
+                           for d_col in range(3) for d_row in range(3)) for cluster in range(BOARD_SIZE))
+    return columns, rows, clusters
+
+
+TARGET_POSITION_GROUPS = _build_target_position_groups()
+TARGET_INDEX_TABLE = np.array([[pos.row * BOARD_SIZE + pos.col for pos in group]
+                               for groups in TARGET_POSITION_GROUPS for group in groups], dtype=np.int16)
+TARGET_INDEX_TABLE.flags.writeable = False
+TARGET_MASK_TABLE = np.zeros((len(TARGET_INDEX_TABLE), BOARD_SIZE * BOARD_SIZE), dtype=np.uint8)
+TARGET_MASK_TABLE[np.arange(len(TARGET_INDEX_TABLE))[:, None], TARGET_INDEX_TABLE] = 1
+TARGET_MASK_TABLE = TARGET_MASK_TABLE.reshape((-1, BOARD_SIZE, BOARD_SIZE))
+TARGET_MASK_TABLE.flags.writeable = False
 
 
 def _compute_all_choices_based_on_seed(seed_num: Optional[int] = None):
+    """
+    Helper Method drawing the choices with iter_choice_draws, so State replays the same game.
+    """
+    draws = iter_choice_draws(seed_num, (BOARD_SIZE,) * CLUSTER_KIND_NUM, TURN_LIMIT * CHOICE_NUM)
     all_choices = []
-    if seed_num is not None:
-        rand.seed(seed_num)
-    else:
-        rand.seed(rand.randint)
-    for i in range(27):
+    for i in range(TURN_LIMIT):
         choices = dict()
-        choice0 = dict()
-        cluster0 = rand.randrange(3)
-        cluster_num0 = rand.randrange(9)
-        choice0["tile_type"] = rand.randrange(len(TileType))
-        if cluster0 == 0:
-            if cluster_num0 == 0:
-                choice0["target_positions"] = (
-                    Position(0, 0), Position(0, 1), Position(0, 2), Position(0, 3), Position(0, 4), Position(0, 5),
-                    Position(0, 6), Position(0, 7), Position(0, 8))
-            elif cluster_num0 == 1:
-                choice0["target_positions"] = (
-                    Position(1, 0), Position(1, 1), Position(1, 2), Position(1, 3), Position(1, 4), Position(1, 5),
-                    Position(1, 6), Position(1, 7), Position(1, 8))
-            elif cluster_num0 == 2:
-                choice0["target_positions"] = (
-                    Position(2, 0), Position(2, 1), Position(2, 2), Position(2, 3), Position(2, 4), Position(2, 5),
-                    Position(2, 6), Position(2, 7), Position(2, 8))
-            elif cluster_num0 == 3:
-                choice0["target_positions"] = (
-                    Position(3, 0), Position(3, 1), Position(3, 2), Position(3, 3), Position(3, 4), Position(3, 5),
-                    Position(3, 6), Position(3, 7), Position(3, 8))
-            elif cluster_num0 == 4:
-                choice0["target_positions"] = (
-                    Position(4, 0), Position(4, 1), Position(4, 2), Position(4, 3), Position(4, 4), Position(4, 5),
-                    Position(4, 6), Position(4, 7), Position(4, 8))
-            elif cluster_num0 == 5:
-                choice0["target_positions"] = (
-                    Position(5, 0), Position(5, 1), Position(5, 2), Position(5, 3), Position(5, 4), Position(5, 5),
-                    Position(5, 6), Position(5, 7), Position(5, 8))
-            elif cluster_num0 == 6:
-                choice0["target_positions"] = (
-                    Position(6, 0), Position(6, 1), Position(6, 2), Position(6, 3), Position(6, 4), Position(6, 5),
-                    Position(6, 6), Position(6, 7), Position(6, 8))
-            elif cluster_num0 == 7:
-                choice0["target_positions"] = (
-                    Position(7, 0), Position(7, 1), Position(7, 2), Position(7, 3), Position(7, 4), Position(7, 5),
-                    Position(7, 6), Position(7, 7), Position(7, 8))
-            elif cluster_num0 == 8:
-                choice0["target_positions"] = (
-                    Position(8, 0), Position(8, 1), Position(8, 2), Position(8, 3), Position(8, 4), Position(8, 5),
-                    Position(8, 6), Position(8, 7), Position(8, 8))
-        elif cluster0 == 1:
-            if cluster_num0 == 0:
-                choice0["target_positions"] = (
-                    Position(0, 0), Position(1, 0), Position(2, 0), Position(3, 0), Position(4, 0), Position(5, 0),
-                    Position(6, 0), Position(7, 0), Position(8, 0))
-            elif cluster_num0 == 1:
-                choice0["target_positions"] = (
-                    Position(0, 1), Position(1, 1), Position(2, 1), Position(3, 1), Position(4, 1), Position(5, 1),
-                    Position(6, 1), Position(7, 1), Position(8, 1))
-            elif cluster_num0 == 2:
-                choice0["target_positions"] = (
-                    Position(0, 2), Position(1, 2), Position(2, 2), Position(3, 2), Position(4, 2), Position(5, 2),
-                    Position(6, 2), Position(7, 2), Position(8, 2))
-            elif cluster_num0 == 3:
-                choice0["target_positions"] = (
-                    Position(0, 3), Position(1, 3), Position(2, 3), Position(3, 3), Position(4, 3), Position(5, 3),
-                    Position(6, 3), Position(7, 3), Position(8, 3))
-            elif cluster_num0 == 4:
-                choice0["target_positions"] = (
-                    Position(0, 4), Position(1, 4), Position(2, 4), Position(3, 4), Position(4, 4), Position(5, 4),
-                    Position(6, 4), Position(7, 4), Position(8, 4))
-            elif cluster_num0 == 5:
-                choice0["target_positions"] = (
-                    Position(0, 5), Position(1, 5), Position(2, 5), Position(3, 5), Position(4, 5), Position(5, 5),
-                    Position(6, 5), Position(7, 5), Position(8, 5))
-            elif cluster_num0 == 6:
-                choice0["target_positions"] = (
-                    Position(0, 6), Position(1, 6), Position(2, 6), Position(3, 6), Position(4, 6), Position(5, 6),
-                    Position(6, 6), Position(7, 6), Position(8, 6))
-            elif cluster_num0 == 7:
-                choice0["target_positions"] = (
-                    Position(0, 7), Position(1, 7), Position(2, 7), Position(3, 7), Position(4, 7), Position(5, 7),
-                    Position(6, 7), Position(7, 7), Position(8, 7))
-            elif cluster_num0 == 8:
-                choice0["target_positions"] = (
-                    Position(0, 8), Position(1, 8), Position(2, 8), Position(3, 8), Position(4, 8), Position(5, 8),
-                    Position(6, 8), Position(7, 8), Position(8, 8))
-        elif cluster0 == 2:
-            if cluster_num0 == 0:
-                choice0["target_positions"] = (
-                    Position(0, 0), Position(0, 1), Position(0, 2), Position(1, 0), Position(1, 1), Position(1, 2),
-                    Position(2, 0), Position(2, 1), Position(2, 2))
-            elif cluster_num0 == 1:
-                choice0["target_positions"] = (
-                    Position(0, 3), Position(0, 4), Position(0, 5), Position(1, 3), Position(1, 4), Position(1, 5),
-                    Position(2, 3), Position(2, 4), Position(2, 5))
-            elif cluster_num0 == 2:
-                choice0["target_positions"] = (
-                    Position(0, 6), Position(0, 7), Position(0, 8), Position(1, 6), Position(1, 7), Position(1, 8),
-                    Position(2, 6), Position(2, 7), Position(2, 8))
-            elif cluster_num0 == 3:
-                choice0["target_positions"] = (
-                    Position(3, 0), Position(3, 1), Position(3, 2), Position(4, 0), Position(4, 1), Position(4, 2),
-                    Position(5, 0), Position(5, 1), Position(5, 2))
-            elif cluster_num0 == 4:
-                choice0["target_positions"] = (
-                    Position(3, 3), Position(3, 4), Position(3, 5), Position(4, 3), Position(4, 4), Position(4, 5),
-                    Position(5, 3), Position(5, 4), Position(5, 5))
-            elif cluster_num0 == 5:
-                choice0["target_positions"] = (
-                    Position(3, 6), Position(3, 7), Position(3, 8), Position(4, 6), Position(4, 7), Position(4, 8),
-                    Position(5, 6), Position(5, 7), Position(5, 8))
-            elif cluster_num0 == 6:
-                choice0["target_positions"] = (
-                    Position(6, 0), Position(6, 1), Position(6, 2), Position(7, 0), Position(7, 1), Position(7, 2),
-                    Position(8, 0), Position(8, 1), Position(8, 2))
-            elif cluster_num0 == 7:
-                choice0["target_positions"] = (
-                    Position(6, 3), Position(6, 4), Position(6, 5), Position(7, 3), Position(7, 4), Position(7, 5),
-                    Position(7, 3), Position(7, 4), Position(7, 5))
-            elif cluster_num0 == 8:
-                choice0["target_positions"] = (
-                    Position(6, 6), Position(6, 7), Position(6, 8), Position(7, 6), Position(7, 7), Position(7, 8),
-                    Position(8, 6), Position(8, 7), Position(8, 8))
-        choices["choice0"] = choice0
-        choice1 = dict()
-        cluster1 = rand.randrange(3)
-        cluster_num1 = rand.randrange(9)
-        choice1["tile_type"] = rand.randrange(len(TileType))
-        if cluster1 == 0:
-            if cluster_num1 == 0:
-                choice1["target_positions"] = (
-                    Position(0, 0), Position(0, 1), Position(0, 2), Position(0, 3), Position(0, 4), Position(0, 5),
-                    Position(0, 6), Position(0, 7), Position(0, 8))
-            elif cluster_num1 == 1:
-                choice1["target_positions"] = (
-                    Position(1, 0), Position(1, 1), Position(1, 2), Position(1, 3), Position(1, 4), Position(1, 5),
-                    Position(1, 6), Position(1, 7), Position(1, 8))
-            elif cluster_num1 == 2:
-                choice1["target_positions"] = (
-                    Position(2, 0), Position(2, 1), Position(2, 2), Position(2, 3), Position(2, 4), Position(2, 5),
-                    Position(2, 6), Position(2, 7), Position(2, 8))
-            elif cluster_num1 == 3:
-                choice1["target_positions"] = (
-                    Position(3, 0), Position(3, 1), Position(3, 2), Position(3, 3), Position(3, 4), Position(3, 5),
-                    Position(3, 6), Position(3, 7), Position(3, 8))
-            elif cluster_num1 == 4:
-                choice1["target_positions"] = (
-                    Position(4, 0), Position(4, 1), Position(4, 2), Position(4, 3), Position(4, 4), Position(4, 5),
-                    Position(4, 6), Position(4, 7), Position(4, 8))
-            elif cluster_num1 == 5:
-                choice1["target_positions"] = (
-                    Position(5, 0), Position(5, 1), Position(5, 2), Position(5, 3), Position(5, 4), Position(5, 5),
-                    Position(5, 6), Position(5, 7), Position(5, 8))
-            elif cluster_num1 == 6:
-                choice1["target_positions"] = (
-                    Position(6, 0), Position(6, 1), Position(6, 2), Position(6, 3), Position(6, 4), Position(6, 5),
-                    Position(6, 6), Position(6, 7), Position(6, 8))
-            elif cluster_num1 == 7:
-                choice1["target_positions"] = (
-                    Position(7, 0), Position(7, 1), Position(7, 2), Position(7, 3), Position(7, 4), Position(7, 5),
-                    Position(7, 6), Position(7, 7), Position(7, 8))
-            elif cluster_num1 == 8:
-                choice1["target_positions"] = (
-                    Position(8, 0), Position(8, 1), Position(8, 2), Position(8, 3), Position(8, 4), Position(8, 5),
-                    Position(8, 6), Position(8, 7), Position(8, 8))
-        elif cluster1 == 1:
-            if cluster_num1 == 0:
-                choice1["target_positions"] = (
-                    Position(0, 0), Position(1, 0), Position(2, 0), Position(3, 0), Position(4, 0), Position(5, 0),
-                    Position(6, 0), Position(7, 0), Position(8, 0))
-            elif cluster_num1 == 1:
-                choice1["target_positions"] = (
-                    Position(0, 1), Position(1, 1), Position(2, 1), Position(3, 1), Position(4, 1), Position(5, 1),
-                    Position(6, 1), Position(7, 1), Position(8, 1))
-            elif cluster_num1 == 2:
-                choice1["target_positions"] = (
-                    Position(0, 2), Position(1, 2), Position(2, 2), Position(3, 2), Position(4, 2), Position(5, 2),
-                    Position(6, 2), Position(7, 2), Position(8, 2))
-            elif cluster_num1 == 3:
-                choice1["target_positions"] = (
-                    Position(0, 3), Position(1, 3), Position(2, 3), Position(3, 3), Position(4, 3), Position(5, 3),
-                    Position(6, 3), Position(7, 3), Position(8, 3))
-            elif cluster_num1 == 4:
-                choice1["target_positions"] = (
-                    Position(0, 4), Position(1, 4), Position(2, 4), Position(3, 4), Position(4, 4), Position(5, 4),
-                    Position(6, 4), Position(7, 4), Position(8, 4))
-            elif cluster_num1 == 5:
-                choice1["target_positions"] = (
-                    Position(0, 5), Position(1, 5), Position(2, 5), Position(3, 5), Position(4, 5), Position(5, 5),
-                    Position(6, 5), Position(7, 5), Position(8, 5))
-            elif cluster_num1 == 6:
-                choice1["target_positions"] = (
-                    Position(0, 6), Position(1, 6), Position(2, 6), Position(3, 6), Position(4, 6), Position(5, 6),
-                    Position(6, 6), Position(7, 6), Position(8, 6))
-            elif cluster_num1 == 7:
-                choice1["target_positions"] = (
-                    Position(0, 7), Position(1, 7), Position(2, 7), Position(3, 7), Position(4, 7), Position(5, 7),
-                    Position(6, 7), Position(7, 7), Position(8, 7))
-            elif cluster_num1 == 8:
-                choice1["target_positions"] = (
-                    Position(0, 8), Position(1, 8), Position(2, 8), Position(3, 8), Position(4, 8), Position(5, 8),
-                    Position(6, 8), Position(7, 8), Position(8, 8))
-        elif cluster1 == 2:
-            if cluster_num1 == 0:
-                choice1["target_positions"] = (
-                    Position(0, 0), Position(0, 1), Position(0, 2), Position(1, 0), Position(1, 1), Position(1, 2),
-                    Position(2, 0), Position(2, 1), Position(2, 2))
-            elif cluster_num1 == 1:
-                choice1["target_positions"] = (
-                    Position(0, 3), Position(0, 4), Position(0, 5), Position(1, 3), Position(1, 4), Position(1, 5),
-                    Position(2, 3), Position(2, 4), Position(2, 5))
-            elif cluster_num1 == 2:
-                choice1["target_positions"] = (
-                    Position(0, 6), Position(0, 7), Position(0, 8), Position(1, 6), Position(1, 7), Position(1, 8),
-                    Position(2, 6), Position(2, 7), Position(2, 8))
-            elif cluster_num1 == 3:
-                choice1["target_positions"] = (
-                    Position(3, 0), Position(3, 1), Position(3, 2), Position(4, 0), Position(4, 1), Position(4, 2),
-                    Position(5, 0), Position(5, 1), Position(5, 2))
-            elif cluster_num1 == 4:
-                choice1["target_positions"] = (
-                    Position(3, 3), Position(3, 4), Position(3, 5), Position(4, 3), Position(4, 4), Position(4, 5),
-                    Position(5, 3), Position(5, 4), Position(5, 5))
-            elif cluster_num1 == 5:
-                choice1["target_positions"] = (
-                    Position(3, 6), Position(3, 7), Position(3, 8), Position(4, 6), Position(4, 7), Position(4, 8),
-                    Position(5, 6), Position(5, 7), Position(5, 8))
-            elif cluster_num1 == 6:
-                choice1["target_positions"] = (
-                    Position(6, 0), Position(6, 1), Position(6, 2), Position(7, 0), Position(7, 1), Position(7, 2),
-                    Position(8, 0), Position(8, 1), Position(8, 2))
-            elif cluster_num1 == 7:
-                choice1["target_positions"] = (
-                    Position(6, 3), Position(6, 4), Position(6, 5), Position(7, 3), Position(7, 4), Position(7, 5),
-                    Position(7, 3), Position(7, 4), Position(7, 5))
-            elif cluster_num1 == 8:
-                choice1["target_positions"] = (
-                    Position(6, 6), Position(6, 7), Position(6, 8), Position(7, 6), Position(7, 7), Position(7, 8),
-                    Position(8, 6), Position(8, 7), Position(8, 8))
-        choices["choice1"] = 0
+        for choice_idx in range(CHOICE_NUM):
+            cluster_kind, cluster_num, tile_type = next(draws)
+            choices["choice" + str(choice_idx)] = {
+                "tile_type": tile_type,
+                "target_positions": TARGET_POSITION_GROUPS[cluster_kind][cluster_num],
+                "target_group": cluster_kind * BOARD_SIZE + cluster_num}
         all_choices.append(choices)
     return all_choices
 
 
+def compute_choice_schedules(rng: np.random.Generator, schedule_num: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Draws the choices of many games at once, with the same distribution as _compute_all_choices_based_on_seed.
+    :return: The tile type codes and the target groups, as rows of TARGET_INDEX_TABLE,
+    each of shape (schedule_num, TURN_LIMIT, CHOICE_NUM).
+    """
+    schedule_shape = (schedule_num, TURN_LIMIT, CHOICE_NUM)
+    targets = rng.integers(0, CLUSTER_KIND_NUM, schedule_shape, dtype=np.int16) * BOARD_SIZE + \
+        rng.integers(0, BOARD_SIZE, schedule_shape, dtype=np.int16)
+    return rng.integers(0, len(TileType), schedule_shape, dtype=np.int8), targets
+
+
+def _get_read_only_view(arr: np.ndarray) -> np.ndarray:
+    """
+    Helper Method viewing the array without write access: the view follows every change the env makes to the array,
+    but the caller cannot change it.
+    """
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+def build_observation_space() -> Dict:
+    """
+    :return: The observation space of one game: the board planes, the current choices, the score and the turn.
+    """
+    board_shape = (BOARD_SIZE, BOARD_SIZE)
+    int32_info = np.iinfo(np.int32)
+    return Dict(
+        {
+            "board": Box(0, len(TileType) - 1, shape=board_shape, dtype=np.uint8),
+            "on_island": Box(0, 1, shape=board_shape, dtype=np.uint8),
+            "on_shore": Box(0, 1, shape=board_shape, dtype=np.uint8),
+            "choice_tile_types": Box(0, len(TileType) - 1, shape=(CHOICE_NUM,), dtype=np.uint8),
+            "choice_targets": Box(0, 1, shape=(CHOICE_NUM,) + board_shape, dtype=np.uint8),
+            "score": Box(int32_info.min, int32_info.max, shape=(1,), dtype=np.int32),
+            "turns_passed": Box(0, TURN_LIMIT, shape=(1,), dtype=np.int32)
+        }
+    )
+
+
+class EnvSnapshot:
+    """
+    The state of a TinyIslandsWithoutIslands game: a private copy of the board, the turn counter and a reference to
+    the choice schedule, which is shared between snapshots since nothing mutates it after reset.
+    """
+    __slots__ = ("board", "turns_passed", "choices")
+
+    def __init__(self, board: Board, turns_passed: int, choices: list):
+        self.board = board
+        self.turns_passed = turns_passed
+        self.choices = choices
+
+
 class TinyIslandsWithoutIslands(Env):
     """Custom Environment that follows gym interface"""
-    metadata = {"render.modes": ["human"
+    metadata = {"render_modes": ["human"
                                  # , "rgb_array"
                                  ], "render_fps": 4}
 
@@ -264,93 +125,161 @@ class TinyIslandsWithoutIslands(Env):
         self.window_size = 512
         self.action_space = Dict(
             {
-                "choice": Discrete(2),
-                "target_position:": Box(0, 8, shape=(2,), dtype=int)
-            }
-        )
-        self.observation_space = Dict(
-            {
-                "board": Box(0, len(TileType) - 1, shape=(8, 8), dtype=Discrete),
-                "score": int,
-                "turns_passed": int,
-                "choices": Dict(
-                    {
-                        "choice0": Dict(
-                            {
-                                "tile_type": Discrete(len(TileType)),
-                                "target_positions": Tuple((Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int)))
-                            }
-                        ),
-                        "choice1": Dict(
-                            {
-                                "tile_type": Discrete(len(TileType)),
-                                "target_positions": Tuple((Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int),
-                                                           Box(0, 8, shape=(2,), dtype=int)))
-                            }
-                        )
-                    }
-                )
+                "choice": Discrete(CHOICE_NUM),
+                "target_position": Box(0, BOARD_SIZE - 1, shape=(2,), dtype=int)
             }
         )
+        board_shape = (BOARD_SIZE, BOARD_SIZE)
+        self.observation_space = build_observation_space()
+        self.observation = {key: np.zeros(space.shape, dtype=space.dtype)
+                            for key, space in self.observation_space.spaces.items()}
+        self._action_mask = np.zeros((CHOICE_NUM,) + board_shape, dtype=bool)
+        self.action_mask = _get_read_only_view(self._action_mask)
+        self.occupied = np.zeros(board_shape, dtype=np.uint8)
         assert render_mode is None or render_mode in self.metadata["render_modes"]
         self.render_mode = render_mode
-        self.reward_range = (-500, 100)
+        self.reward_range = (INVALID_ACTION_REWARD, 100)
         self.window = None
         self.clock = None
 
     def step(self, action: ActType):
-        done = False
-        prev_reward = self.board.get_score()
-        terminated = False
-        choice_num = action["choice"]
-        tar_position = action["target_position"]
-        try:
-            if choice_num == 0:
-                choice = self.choices[self.turns_passed]["choice0"]
-            elif choice_num == 1:
-                choice = self.choices[self.turns_passed]["choice1"]
-            else:
-                raise ValueError("Wrong Input")
-            if tar_position not in choice["target_positions"]:
-                raise ValueError("Target Position Not in Choice")
-            self.board.add_tile_type_at_position(TileType(choice["tile_type"]), tar_position)
-            self.turns_passed += 1
-            if self.turns_passed > 27:
-                terminated = True
-            reward = self.board.get_score() - prev_reward
-        except ValueError:
-            done = True
-            reward = -500
-        return self.board.get_tile_array(), terminated, reward, done, {}
+        """
+        Places the chosen tile type at the target position. The episode terminates after the last turn, or when the
+        next turn has no allowed action, as State ends the game there. Actions outside get_action_mask end the
+        episode with INVALID_ACTION_REWARD; they are rejected by a mask lookup, before touching the board.
+        The observation arrays and the action mask in info are live and read only: the same arrays are returned
+        every step and change with the game, so copy them to keep them.
+        """
+        choice_num = int(action["choice"])
+        tar_col, tar_row = int(action["target_position"][0]), int(action["target_position"][1])
+        if not (0 <= choice_num < CHOICE_NUM and 0 <= tar_col < BOARD_SIZE and 0 <= tar_row < BOARD_SIZE) or \
+                not self.action_mask[choice_num, tar_row, tar_col]:
+            return self._update_observation(), False, INVALID_ACTION_REWARD, True, \
+                {"action_mask": self.action_mask}
+        choice = self.choices[self.turns_passed]["choice" + str(choice_num)]
+        reward = self.board.add_tile_type_at_position(TILE_TYPES[choice["tile_type"]], Position(tar_col, tar_row))
+        self.turns_passed += 1
+        observation = self._update_observation()
+        terminated = not self._action_mask.any()
+        return observation, terminated, reward, False, {"action_mask": self.action_mask}
+
+    def get_action_mask(self) -> np.ndarray:
+        """
+        :return: Boolean array of shape (2, 9, 9), True where placing choice c at column x and row y is allowed:
+        [c, y, x] is in the choice's target positions, vacant, and the choice's tile type is not empty.
+        Maintained in place with the observation, so the same read only array is returned every step.
+        """
+        return self.action_mask
+
+    def _update_observation(self) -> dict:
+        """
+        Helper Method refreshing the observation and the action mask in place. The board, island and occupied masks
+        are views of the Board's arrays, rebound on reset, so only the scalars and the current choices are written.
+        The same arrays are returned every step: copy them to keep an observation.
+        """
+        self.observation["score"][0] = self.board.get_score()
+        self.observation["turns_passed"][0] = self.turns_passed
+        if self.turns_passed < TURN_LIMIT:
+            for choice_idx in range(CHOICE_NUM):
+                choice = self.choices[self.turns_passed]["choice" + str(choice_idx)]
+                self.observation["choice_tile_types"][choice_idx] = choice["tile_type"]
+                np.copyto(self.observation["choice_targets"][choice_idx], TARGET_MASK_TABLE[choice["target_group"]])
+                if choice["tile_type"] == TILE_TYPE_CODES[TileType.EMPTY]:
+                    self._action_mask[choice_idx].fill(False)
+                else:
+                    np.greater(self.observation["choice_targets"][choice_idx], self.occupied,
+                               out=self._action_mask[choice_idx])
+        else:
+            self.observation["choice_tile_types"].fill(0)
+            self.observation["choice_targets"].fill(0)
+            self._action_mask.fill(False)
+        return self.observation
+
+    def get_candidate_rewards(self) -> np.ndarray:
+        """
+        Rewards of every placement offered on the current turn, scored as one batch of candidate boards.
+        :return: Array of shape (number of choices, 9): the reward of placing each choice at each of its
+        target positions, INVALID_ACTION_REWARD where the placement is not allowed.
+        """
+        types, valid, on_island, on_shore, island_ids = self.board.get_score_arrays()
+        current_score = get_batched_scores(types[None], valid[None], on_island[None], on_shore[None],
+                                           island_ids[None])[0]
+        turn_choices = [self.choices[self.turns_passed]["choice" + str(choice_idx)] for choice_idx in range(CHOICE_NUM)]
+        position_num = len(turn_choices[0]["target_positions"])
+        candidate_count = len(turn_choices) * position_num
+        candidate_types = np.repeat(types[None], candidate_count, axis=0)
+        candidate_valid = np.repeat(valid[None], candidate_count, axis=0)
+        is_allowed = np.zeros(candidate_count, dtype=bool)
+        for choice_idx, choice in enumerate(turn_choices):
+            tile_type = TILE_TYPES[choice["tile_type"]]
+            for pos_idx, pos in enumerate(choice["target_positions"]):
+                candidate_idx = choice_idx * position_num + pos_idx
+                if tile_type == TileType.EMPTY or self.board.is_position_occupied(pos):
+                    continue
+                is_allowed[candidate_idx] = True
+                candidate_types[candidate_idx, pos.row, pos.col] = TILE_TYPE_CODES[tile_type]
+                candidate_valid[candidate_idx, pos.row, pos.col] = \
+                    not (tile_type in OFF_ISLAND_TILE_TYPES and on_island[pos.row, pos.col])
+        candidates_shape = (candidate_count,) + types.shape
+        scores = get_batched_scores(candidate_types, candidate_valid,
+                                    np.broadcast_to(on_island, candidates_shape),
+                                    np.broadcast_to(on_shore, candidates_shape),
+                                    np.broadcast_to(island_ids, candidates_shape))
+        rewards = np.where(is_allowed, scores - current_score, INVALID_ACTION_REWARD)
+        return rewards.reshape((len(turn_choices), position_num))
 
     def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        """
+        Starts a new game with the choices drawn from the seed. If its first turn has no allowed action, the game is
+        over before it starts and the action mask is empty.
+        The observation arrays and the action mask in info are live and read only, as in step.
+        """
         super().reset(seed=seed)
         self.board = Board()
         self.turns_passed = 0
         self.choices = _compute_all_choices_based_on_seed(seed)
         if self.render_mode == "human":
             self.render()
-        initial_observation = dict()
-        initial_observation["board"] = self.board.get_tile_array()
-        initial_observation["score"] = 0
-        initial_observation["turns_passed"] = 0
-        initial_observation["choices"] = self.choices[0]
-        return initial_observation, {}
+        self._bind_board_views()
+        return self._update_observation(), {"action_mask": self.action_mask}
+
+    def _bind_board_views(self):
+        """
+        Helper Method pointing the board planes of the observation, and the occupied mask, at the current Board.
+        The views are read only, so writing to an observation cannot change the game behind the Board's caches.
+        """
+        board_shape = (BOARD_SIZE, BOARD_SIZE)
+        self.observation["board"], self.observation["on_island"], self.observation["on_shore"], self.occupied = \
+            (_get_read_only_view(np.frombuffer(buffer, dtype=np.uint8).reshape(board_shape))
+             for buffer in (self.board.types, self.board.on_island, self.board.on_shore, self.board.occupied))
+
+    def get_state(self) -> EnvSnapshot:
+        """
+        :return: A snapshot of the game, restorable any number of times with set_state.
+        """
+        return EnvSnapshot(self.board.clone(), self.turns_passed, self.choices)
+
+    def set_state(self, state: EnvSnapshot):
+        """
+        Restores a snapshot taken by get_state, on this env or on another one.
+        """
+        self.board = state.board.clone()
+        self.turns_passed = state.turns_passed
+        self.choices = state.choices
+        self._bind_board_views()
+        self._update_observation()
+
+    def clone(self) -> "TinyIslandsWithoutIslands":
+        """
+        :return: An independent env in the same state, sharing the spaces and the choice schedule.
+        """
+        other = copy.copy(self)
+        other.observation = {key: arr.copy() for key, arr in self.observation.items()}
+        other._action_mask = self._action_mask.copy()
+        other.action_mask = _get_read_only_view(other._action_mask)
+        other.board = self.board.clone()
+        other._bind_board_views()
+        return other
 
     def render(self, mode='human', close=False):
         # Render the environment to the screen
@@ -0,0 +1,240 @@
+from typing import Dict, List, Optional, Tuple
+import time
+
+from tinyisland.Board import Board, EMPTY_CODE, HOUSES_CODE, CHURCHES_CODE, FOREST_CODE, MOUNTAIN_CODE, BOATS_CODE, \
+    ON_ISLAND_TILE_CODES, TILE_TYPE_CODES, HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY, \
+    CHURCHES_REWARD_PER_HOUSES_NEARBY, FOREST_REWARD_PER_FOREST_ADJACENT, MOUNTAIN_REWARD_PER_FOREST_NEARBY, \
+    WAVES_REWARD_IF_UNIQUE_COLUMN_ROW, BEACHES_REWARD_IF_ON_SHORE
+from tinyisland.State import State
+from tinyisland.Tile import Position, TileType
+
+UNIQUE_TYPE_NUM = len(TileType) - 1
+
+
+def _get_boat_score_limit(board: Board) -> int:
+    """
+    Helper Method bounding the score of a boat: the longest walk to an island tile, or the unreachable score.
+    """
+    return max(board.row_num + board.col_num - 2, board.row_num, board.col_num)
+
+
+def get_tile_type_score_limit(board: Board, tile_code: int, support_count: int = 8) -> int:
+    """
+    param support_count: The most tiles the tile can ever score from: unique types for houses, houses for churches,
+    forests for forests and mountains.
+    :return: The highest score a tile of the type can reach on the board.
+    """
+    if tile_code == HOUSES_CODE:
+        return HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY * min(UNIQUE_TYPE_NUM, support_count)
+    elif tile_code == CHURCHES_CODE:
+        return CHURCHES_REWARD_PER_HOUSES_NEARBY * min(8, support_count)
+    elif tile_code == FOREST_CODE:
+        return FOREST_REWARD_PER_FOREST_ADJACENT * min(4, support_count)
+    elif tile_code == MOUNTAIN_CODE:
+        return MOUNTAIN_REWARD_PER_FOREST_NEARBY * min(8, support_count)
+    elif tile_code == BOATS_CODE:
+        return _get_boat_score_limit(board)
+    elif tile_code == TILE_TYPE_CODES[TileType.WAVES]:
+        return WAVES_REWARD_IF_UNIQUE_COLUMN_ROW
+    elif tile_code == TILE_TYPE_CODES[TileType.BEACHES]:
+        return BEACHES_REWARD_IF_ON_SHORE
+    return 0
+
+
+def get_upper_bound(state: State) -> int:
+    """
+    Admissible bound on the final score of a game without islands, as State plays it. The bound is loose on long
+    games, several times the best score reachable, so it only certifies optimality once the search closes the gap.
+    A placed tile only gains from its vacant tiles that later turns can fill with what it scores from: a house one
+    unique type per playable turn, a church one house per turn offering houses, a forest or a mountain one forest
+    per turn offering forests. Boats never gain once some on island tile exists, and waves never gain.
+    Every remaining turn adds the best score limit among its tile types, supported by the tiles on the board and
+    by the other remaining turns.
+    """
+    board = state.board
+    lo_turn_codes = [{TILE_TYPE_CODES[choice.tile_type] for choice in state.choices[turn_num]} - {EMPTY_CODE}
+                     for turn_num in range(state.turns_passed, state.turn_limit)]
+    playable_turns = sum(1 for turn_codes in lo_turn_codes if turn_codes)
+    house_turns = sum(1 for turn_codes in lo_turn_codes if HOUSES_CODE in turn_codes)
+    forest_turns = sum(1 for turn_codes in lo_turn_codes if FOREST_CODE in turn_codes)
+    types, adjacency = board.types, board.adjacency
+    has_island_target = any(tile_code in ON_ISLAND_TILE_CODES for tile_code in types)
+    board.get_score()
+    bound = 0
+    for idx, tile_code in enumerate(types):
+        if tile_code == EMPTY_CODE:
+            continue
+        tile_score = board.tile_scores[idx]
+        if tile_code in (HOUSES_CODE, CHURCHES_CODE, FOREST_CODE, MOUNTAIN_CODE) and playable_turns:
+            neighbors = adjacency.adj[idx] if tile_code == FOREST_CODE else adjacency.adj_near[idx]
+            vacant_count = sum(1 for neighbor in neighbors if types[neighbor] == EMPTY_CODE)
+            if tile_code == HOUSES_CODE:
+                unique_count = tile_score // HOUSES_REWARD_PER_UNIQUE_TYPE_NEARBY
+                tile_score = get_tile_type_score_limit(board, tile_code,
+                                                       unique_count + min(vacant_count, playable_turns))
+            elif tile_code == CHURCHES_CODE:
+                tile_score += CHURCHES_REWARD_PER_HOUSES_NEARBY * min(vacant_count, house_turns)
+            elif tile_code == FOREST_CODE:
+                tile_score += FOREST_REWARD_PER_FOREST_ADJACENT * min(vacant_count, forest_turns)
+            else:
+                tile_score += MOUNTAIN_REWARD_PER_FOREST_NEARBY * min(vacant_count, forest_turns)
+        elif tile_code == BOATS_CODE and not has_island_target and playable_turns:
+            tile_score = _get_boat_score_limit(board)
+        bound += tile_score
+    unique_count = len(set(types) - {EMPTY_CODE})
+    house_count = sum(1 for tile_code in types if tile_code == HOUSES_CODE)
+    forest_count = sum(1 for tile_code in types if tile_code == FOREST_CODE)
+    for turn_codes in lo_turn_codes:
+        if not turn_codes:
+            continue
+        lo_support = {HOUSES_CODE: unique_count + playable_turns - 1,
+                      CHURCHES_CODE: house_count + house_turns - (HOUSES_CODE in turn_codes),
+                      FOREST_CODE: forest_count + forest_turns - 1,
+                      MOUNTAIN_CODE: forest_count + forest_turns - (FOREST_CODE in turn_codes)}
+        bound += max(get_tile_type_score_limit(board, tile_code, lo_support.get(tile_code, 0))
+                     for tile_code in turn_codes)
+    return bound
+
+
+class SolverResult:
+    """
+    The outcome of a solve: the best score found and the moves reaching it, a certified upper bound on the optimal
+    score, the nodes expanded and, for anytime use, the (seconds, best score) pairs at every improvement.
+    """
+
+    def __init__(self, best_score: int, best_path: List[Tuple[int, Position]], upper_bound: int, nodes_expanded: int,
+                 anytime: List[Tuple[float, int]]):
+        self.best_score = best_score
+        self.best_path = best_path
+        self.upper_bound = upper_bound
+        self.nodes_expanded = nodes_expanded
+        self.anytime = anytime
+
+    @property
+    def is_optimal(self) -> bool:
+        return self.best_score >= self.upper_bound
+
+
+class GameSolver:
+    """
+    Iterative deepening branch and bound over full State games. Each iteration searches every move up to a depth
+    and finishes the game greedily past it, giving a complete game, so a solution exists from the first iteration.
+    Subtrees are cut when their bound cannot beat the best score, children are searched best reward first, and
+    a transposition table keyed by turn and board keeps the tightest bound proven for each position.
+    Every node returns a certified bound on its subtree, so the root bound tightens as iterations deepen and equals
+    the best score once the search is complete.
+    """
+
+    def __init__(self, init_state: State, time_limit: Optional[float] = None, node_limit: Optional[int] = None):
+        self.init_state = init_state
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.bounds: Dict[Tuple[int, bytes], int] = dict()
+        self.best_score = None
+        self.best_path = []
+        self.nodes_expanded = 0
+        self.anytime = []
+        self.start_time = None
+
+    def _is_out_of_budget(self) -> bool:
+        return (self.node_limit is not None and self.nodes_expanded >= self.node_limit) or \
+            (self.time_limit is not None and time.time() - self.start_time >= self.time_limit)
+
+    def _publish_best(self, score: int, path: List[Tuple[int, Position]]):
+        if self.best_score is None or score > self.best_score:
+            self.best_score = score
+            self.best_path = list(path)
+            self.anytime.append((time.time() - self.start_time, score))
+
+    def _get_ordered_children(self, state: State) -> List[Tuple[int, Tuple[int, Position], State]]:
+        """
+        Helper Method expanding every distinct move, the highest reward first. Choices offering the same tile type
+        on overlapping ranges lead to the same child, which is kept once.
+        """
+        lo_children, seen = [], set()
+        for choice_idx, pos in state.get_legal_moves():
+            key = (state.choices[state.turns_passed][choice_idx].tile_type, pos)
+            if key in seen:
+                continue
+            seen.add(key)
+            child = state.clone()
+            reward = child.apply_move(choice_idx, pos)
+            lo_children.append((reward, (choice_idx, pos), child))
+        lo_children.sort(key=lambda child_info: -child_info[0])
+        return lo_children
+
+    def _complete_greedily(self, state: State, path: List[Tuple[int, Position]]):
+        """
+        Helper Method finishing the game with the highest reward move every turn, publishing the result.
+        """
+        state, path = state.clone(), list(path)
+        while True:
+            lo_children = self._get_ordered_children(state)
+            if not lo_children:
+                break
+            _, move, state = lo_children[0]
+            path.append(move)
+        self._publish_best(state.get_score(), path)
+
+    def _search(self, state: State, path: List[Tuple[int, Position]], depth: int) -> int:
+        """
+        Helper Method searching the subtree to the depth.
+        :return: A certified upper bound on the best final score of the subtree.
+        """
+        self.nodes_expanded += 1
+        if state.is_terminal():
+            self._publish_best(state.get_score(), path)
+            return state.get_score()
+        key = (state.turns_passed, bytes(state.board.types))
+        bound = min(get_upper_bound(state), self.bounds.get(key, float("inf")))
+        if bound <= self.best_score or self._is_out_of_budget():
+            return bound
+        if depth == 0:
+            self._complete_greedily(state, path)
+            return bound
+        subtree_bound = None
+        for _, move, child in self._get_ordered_children(state):
+            path.append(move)
+            child_bound = self._search(child, path, depth - 1)
+            path.pop()
+            subtree_bound = child_bound if subtree_bound is None else max(subtree_bound, child_bound)
+        subtree_bound = min(bound, subtree_bound)
+        self.bounds[key] = subtree_bound
+        return subtree_bound
+
+    def solve(self) -> SolverResult:
+        self.start_time = time.time()
+        self._complete_greedily(self.init_state, [])
+        upper_bound = get_upper_bound(self.init_state)
+        remaining_turns = self.init_state.turn_limit - self.init_state.turns_passed
+        for depth in range(1, remaining_turns + 1):
+            upper_bound = min(upper_bound, self._search(self.init_state, [], depth))
+            if self.best_score >= upper_bound or self._is_out_of_budget():
+                break
+        return SolverResult(self.best_score, self.best_path, max(upper_bound, self.best_score), self.nodes_expanded,
+                            self.anytime)
+
+
+def solve_game(init_state: State, time_limit: Optional[float] = None,
+               node_limit: Optional[int] = None) -> SolverResult:
+    """
+    Solves the game with GameSolver within the budget; without any budget the search runs to optimality.
+    """
+    return GameSolver(init_state, time_limit, node_limit).solve()
+
+
+if __name__ == "__main__":
+    print("-------------------------------------------------")
+    for game_seed, game_turns in ((0, 4), (1, 8), (2, 30)):
+        start_time = time.time()
+        result = solve_game(State(game_seed, turn_limit=game_turns), time_limit=10)
+        print("Seed " + str(game_seed) + ", " + str(game_turns) + " Turns")
+        print("--- %s seconds ---" % (time.time() - start_time))
+        bound_gap = result.upper_bound - result.best_score
+        print("Best Score: " + str(result.best_score) + ", Upper Bound: " + str(result.upper_bound) +
+              ", Optimal: " + str(result.is_optimal))
+        print("Bound Gap: " + str(bound_gap) + " (" + str(round(100 * bound_gap / max(result.best_score, 1))) +
+              "% of the best score)")
+        print("Nodes Expanded: " + str(result.nodes_expanded))
+        print("Anytime: " + str([(round(seconds, 3), score) for seconds, score in result.anytime]))
+    print("-------------------------------------------------")
@@ -0,0 +1,280 @@
+from typing import Optional
+import time
+
+from gym.vector.utils import batch_space
+import numpy as np
+
+from tinyisland.Board import EMPTY_CODE, HOUSES_CODE, FOREST_CODE, BOATS_CODE, WAVES_CODE, ON_ISLAND_TILE_CODES, \
+    UNREACHABLE_DISTANCE, get_batched_scores, get_tile_rule_scores
+from tinyisland.Tile import TileType, AdjacencyTable
+from tinyisland.env import TinyIslandsWithoutIslands, INVALID_ACTION_REWARD, TURN_LIMIT, BOARD_SIZE, CHOICE_NUM, \
+    TARGET_MASK_TABLE, TARGET_INDEX_TABLE, build_observation_space, compute_choice_schedules
+
+SENTINEL_INDEX = BOARD_SIZE * BOARD_SIZE
+
+
+def _build_neighbor_tables():
+    """
+    Helper Method padding the adjacency of a 9x9 board into fixed width index tables, where missing neighbors
+    point at SENTINEL_INDEX, an extra always empty tile.
+    :return: The adjacent (82, 4) and near (82, 8) tables, the (81, 9) table of each tile with its near tiles,
+    the (81, 16) table of the other tiles of its column and row, the (81, 81) Manhattan distances,
+    and the row and column of every tile.
+    """
+    adjacency = AdjacencyTable.get(BOARD_SIZE, BOARD_SIZE)
+    adj = np.full((SENTINEL_INDEX + 1, 4), SENTINEL_INDEX, dtype=np.int16)
+    near = np.full((SENTINEL_INDEX + 1, 8), SENTINEL_INDEX, dtype=np.int16)
+    for idx in range(SENTINEL_INDEX):
+        adj[idx, :len(adjacency.adj[idx])] = adjacency.adj[idx]
+        near[idx, :len(adjacency.adj_near[idx])] = adjacency.adj_near[idx]
+    local = np.concatenate((np.arange(SENTINEL_INDEX, dtype=np.int16)[:, None], near[:-1]), axis=1)
+    col_row = np.array(adjacency.col_row, dtype=np.int16)
+    rows, cols = np.divmod(np.arange(SENTINEL_INDEX + 1), BOARD_SIZE)
+    distances = np.abs(rows[:-1, None] - rows[None, :-1]) + np.abs(cols[:-1, None] - cols[None, :-1])
+    return adj, near, local, col_row, distances.astype(np.uint8), rows, np.where(rows < BOARD_SIZE, cols, 0)
+
+
+ADJ_TABLE, NEAR_TABLE, LOCAL_TABLE, COL_ROW_TABLE, MANHATTAN_DISTANCES, TILE_ROWS, TILE_COLS = _build_neighbor_tables()
+TYPE_BITS = np.array([0] + [1 << code for code in range(1, len(TileType))], dtype=np.uint8)
+BIT_COUNTS = np.array([bin(bits).count("1") for bits in range(256)], dtype=np.int16)
+
+
+class TinyIslandVecEnv:
+    """
+    N games of TinyIslandsWithoutIslands held in stacked arrays and stepped together.
+    Choice schedules, placement validation and scoring are vectorized across games. Games that end, by running
+    out of turns, by reaching a turn with no allowed action or by an invalid action, are reset automatically with
+    a fresh schedule, drawn again until its first turn has an allowed action.
+    Schedules are drawn from a NumPy Generator, so a seed does not give the same schedule as the single env.
+    Observations, actions and action masks are those of the single env with a leading game dimension, so a policy
+    runs on either env.
+
+    Scores are maintained incrementally, as Board does: a placement rescores only its own tile, its near tiles and,
+    for waves, the tiles sharing its column or row, and boats read a distance to island field lowered by every new
+    on island tile. Without islands every tile stays valid, so that distance is the Manhattan distance.
+    """
+
+    def __init__(self, num_envs: int, seed: Optional[int] = None):
+        self.num_envs = num_envs
+        self.single_observation_space = build_observation_space()
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.rng = np.random.default_rng(seed)
+        self.types = np.zeros((num_envs, SENTINEL_INDEX + 1), dtype=np.int8)
+        self.tile_scores = np.zeros((num_envs, SENTINEL_INDEX + 1), dtype=np.int16)
+        self.island_distances = np.full((num_envs, SENTINEL_INDEX), UNREACHABLE_DISTANCE, dtype=np.uint8)
+        self.wave_row_counts = np.zeros((num_envs, BOARD_SIZE + 1), dtype=np.int8)
+        self.wave_col_counts = np.zeros((num_envs, BOARD_SIZE), dtype=np.int8)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.turns_passed = np.zeros(num_envs, dtype=np.int16)
+        self.choice_tile_types = np.zeros((num_envs, TURN_LIMIT, CHOICE_NUM), dtype=np.int8)
+        self.choice_targets = np.zeros((num_envs, TURN_LIMIT, CHOICE_NUM), dtype=np.int16)
+
+    def _reset_envs(self, env_mask: np.ndarray):
+        """
+        Helper Method clearing the boards of the masked games and drawing their choice schedules, until every game
+        has an allowed action on its first turn.
+        """
+        reset_count = int(env_mask.sum())
+        if not reset_count:
+            return
+        self.types[env_mask] = EMPTY_CODE
+        self.tile_scores[env_mask] = 0
+        self.island_distances[env_mask] = UNREACHABLE_DISTANCE
+        self.wave_row_counts[env_mask] = 0
+        self.wave_col_counts[env_mask] = 0
+        self.scores[env_mask] = 0
+        self.turns_passed[env_mask] = 0
+        while reset_count:
+            self.choice_tile_types[env_mask], self.choice_targets[env_mask] = \
+                compute_choice_schedules(self.rng, reset_count)
+            env_mask = env_mask & ~self.get_action_mask().reshape((self.num_envs, -1)).any(axis=1)
+            reset_count = int(env_mask.sum())
+
+    def _score_tiles(self, env_idx: np.ndarray, tile_idx: np.ndarray) -> np.ndarray:
+        """
+        Helper Method scoring tiles of the games, identically to Board._get_score_of_tile on a board without islands.
+        The counts around the tiles are gathered through the neighbor tables, and turned into scores by the rules
+        shared with score_tile_arrays, get_tile_rule_scores.
+        param env_idx: Array of shape (M, 1) of game indices.
+        param tile_idx: Array of shape (M, K) of flat tile indices, SENTINEL_INDEX allowed.
+        :return: Array of shape (M, K) of the tile scores.
+        """
+        near_types = self.types[env_idx[:, :, None], NEAR_TABLE[tile_idx]]
+        adj_types = self.types[env_idx[:, :, None], ADJ_TABLE[tile_idx]]
+        return get_tile_rule_scores(self.types[env_idx, tile_idx],
+                                    BIT_COUNTS[np.bitwise_or.reduce(TYPE_BITS[near_types], axis=-1)],
+                                    (near_types == HOUSES_CODE).sum(axis=-1), (adj_types == FOREST_CODE).sum(axis=-1),
+                                    (near_types == FOREST_CODE).sum(axis=-1),
+                                    self._get_boat_distances(env_idx, tile_idx), self._is_lone_wave(env_idx, tile_idx),
+                                    False, BOARD_SIZE)
+
+    def _get_boat_distances(self, env_idx: np.ndarray, tile_idx: np.ndarray) -> np.ndarray:
+        return self.island_distances[env_idx, np.minimum(tile_idx, SENTINEL_INDEX - 1)]
+
+    def _is_lone_wave(self, env_idx: np.ndarray, tile_idx: np.ndarray) -> np.ndarray:
+        return (self.wave_row_counts[env_idx, TILE_ROWS[tile_idx]] == 1) & \
+            (self.wave_col_counts[env_idx, TILE_COLS[tile_idx]] == 1)
+
+    def _get_current_choices(self):
+        """
+        :return: The tile type codes and target group indices offered to every game this turn, each of shape (N, 2).
+        """
+        env_idx = np.arange(self.num_envs)
+        turn_idx = np.minimum(self.turns_passed, TURN_LIMIT - 1)
+        return self.choice_tile_types[env_idx, turn_idx], self.choice_targets[env_idx, turn_idx]
+
+    def _get_board(self) -> np.ndarray:
+        return self.types[:, :SENTINEL_INDEX].reshape((self.num_envs, BOARD_SIZE, BOARD_SIZE))
+
+    def _get_observation(self) -> dict:
+        """
+        Helper Method stacking the observations of every game, as the single env observes a game without islands.
+        """
+        tile_types, targets = self._get_current_choices()
+        board_shape = (self.num_envs, BOARD_SIZE, BOARD_SIZE)
+        return {"board": self._get_board().astype(np.uint8),
+                "on_island": np.zeros(board_shape, dtype=np.uint8),
+                "on_shore": np.zeros(board_shape, dtype=np.uint8),
+                "choice_tile_types": tile_types.astype(np.uint8),
+                "choice_targets": TARGET_MASK_TABLE[targets],
+                "score": self.scores.astype(np.int32)[:, None],
+                "turns_passed": self.turns_passed.astype(np.int32)[:, None]}
+
+    def get_action_mask(self) -> np.ndarray:
+        """
+        :return: Boolean array of shape (N, 2, 9, 9), the single env's action mask of every game: True at [n, c, y, x]
+        where game n can place choice c at column x and row y.
+        """
+        tile_types, targets = self._get_current_choices()
+        return (TARGET_MASK_TABLE[targets] > 0) & (self._get_board() == EMPTY_CODE)[:, None] & \
+            (tile_types != EMPTY_CODE)[:, :, None, None]
+
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._get_observation(), {"action_mask": self.get_action_mask()}
+
+    def step(self, choices: np.ndarray, target_positions: np.ndarray):
+        """
+        Plays one placement in every game.
+        param choices: Array of shape (N,) of the chosen choice index of every game.
+        param target_positions: Array of shape (N, 2) of the (column, row) target of every game.
+        :return: Like TinyIslandsWithoutIslands.step, batched: observations, terminated, rewards, done and an info
+        dict with the action masks and, in "final_score", the scores games ended with, before their automatic reset.
+        """
+        choices, target_positions = np.asarray(choices), np.asarray(target_positions)
+        env_idx = np.arange(self.num_envs)
+        tile_types, targets = self._get_current_choices()
+        is_choice = (choices == 0) | (choices == 1)
+        choices = np.where(is_choice, choices, 0)
+        chosen_types = tile_types[env_idx, choices]
+        in_board = ((target_positions >= 0) & (target_positions < BOARD_SIZE)).all(axis=1)
+        flat_targets = np.where(in_board, target_positions[:, 1] * BOARD_SIZE + target_positions[:, 0], 0)
+        in_range = (TARGET_INDEX_TABLE[targets[env_idx, choices]] == flat_targets[:, None]).any(axis=1)
+        is_valid = is_choice & in_board & in_range & (chosen_types != EMPTY_CODE) & \
+            (self.types[env_idx, flat_targets] == EMPTY_CODE)
+
+        placed_envs, placed_tiles, placed_types = env_idx[is_valid], flat_targets[is_valid], chosen_types[is_valid]
+        self.types[placed_envs, placed_tiles] = placed_types
+        is_wave = placed_types == WAVES_CODE
+        self.wave_row_counts[placed_envs[is_wave], TILE_ROWS[placed_tiles[is_wave]]] += 1
+        self.wave_col_counts[placed_envs[is_wave], TILE_COLS[placed_tiles[is_wave]]] += 1
+        is_target = np.isin(placed_types, ON_ISLAND_TILE_CODES)
+        target_envs = placed_envs[is_target]
+        self.island_distances[target_envs] = np.minimum(self.island_distances[target_envs],
+                                                        MANHATTAN_DISTANCES[placed_tiles[is_target]])
+        local = LOCAL_TABLE[placed_tiles]
+        self.tile_scores[placed_envs[:, None], local] = self._score_tiles(placed_envs[:, None], local)
+        wave_envs, col_row = placed_envs[is_wave][:, None], COL_ROW_TABLE[placed_tiles[is_wave]]
+        col_row_types = self.types[wave_envs, col_row]
+        self.tile_scores[wave_envs, col_row] = np.where(
+            col_row_types == WAVES_CODE,
+            get_tile_rule_scores(col_row_types, 0, 0, 0, 0, UNREACHABLE_DISTANCE,
+                                 self._is_lone_wave(wave_envs, col_row), False, BOARD_SIZE),
+            self.tile_scores[wave_envs, col_row])
+        if target_envs.size:
+            all_tiles = np.arange(SENTINEL_INDEX)[None]
+            board_types = self.types[target_envs, :SENTINEL_INDEX]
+            self.tile_scores[target_envs, :SENTINEL_INDEX] = np.where(
+                board_types == BOATS_CODE,
+                get_tile_rule_scores(board_types, 0, 0, 0, 0, self._get_boat_distances(target_envs[:, None], all_tiles),
+                                     False, False, BOARD_SIZE), self.tile_scores[target_envs, :SENTINEL_INDEX])
+
+        new_scores = self.tile_scores[placed_envs].sum(axis=1, dtype=np.int64)
+        rewards = np.full(self.num_envs, INVALID_ACTION_REWARD, dtype=np.int64)
+        rewards[is_valid] = new_scores - self.scores[is_valid]
+        self.scores[is_valid] = new_scores
+        self.turns_passed[is_valid] += 1
+
+        terminated = is_valid & ((self.turns_passed >= TURN_LIMIT) |
+                                 ~self.get_action_mask().reshape((self.num_envs, -1)).any(axis=1))
+        done = ~is_valid
+        final_scores = self.scores.copy()
+        self._reset_envs(terminated | done)
+        return self._get_observation(), terminated, rewards, done, {"action_mask": self.get_action_mask(),
+                                                                    "final_score": final_scores}
+
+
+def _sample_valid_actions(rng: np.random.Generator, action_mask: np.ndarray):
+    """
+    Helper Method drawing a uniformly random allowed action for every game. Games are reset before a turn without
+    any, so every game has one.
+    """
+    flat_mask = action_mask.reshape((action_mask.shape[0], -1))
+    choices, rows, cols = np.unravel_index((rng.random(flat_mask.shape) * flat_mask).argmax(axis=1),
+                                           action_mask.shape[1:])
+    return choices, np.stack((cols, rows), axis=1)
+
+
+def check_scores(vec_env: TinyIslandVecEnv, observation: dict):
+    """
+    Checks the incrementally maintained scores of every game against a full rescoring of the observed boards
+    with get_batched_scores. Throws an Exception if any differs.
+    """
+    if not np.array_equal(observation["score"][:, 0], get_batched_scores(observation["board"])):
+        raise ValueError("Vectorized Scores Differ From Batched Scores")
+
+
+if __name__ == "__main__":
+    env_num, step_num = 1024, 27 * 4
+    print("-------------------------------------------------")
+    vec_env = TinyIslandVecEnv(env_num, seed=0)
+    obs, _ = vec_env.reset()
+    sample_rng = np.random.default_rng(1)
+    for _ in range(step_num):
+        actions = _sample_valid_actions(sample_rng, vec_env.get_action_mask())
+        obs, _, _, _, _ = vec_env.step(*actions)
+        check_scores(vec_env, obs)
+    print("Scores Match get_batched_scores Over " + str(env_num * step_num) + " Steps")
+
+    obs, _ = vec_env.reset(seed=0)
+    start_time = time.time()
+    for _ in range(step_num):
+        actions = _sample_valid_actions(sample_rng, vec_env.get_action_mask())
+        obs, _, _, _, _ = vec_env.step(*actions)
+    vec_seconds = time.time() - start_time
+    print("Vectorized Steps Per Second: " + str(env_num * step_num / vec_seconds))
+
+    lo_envs = [TinyIslandsWithoutIslands() for _ in range(env_num)]
+    game_count = 0
+    for env in lo_envs:
+        env.reset(seed=game_count)
+        game_count += 1
+    start_time = time.time()
+    for _ in range(step_num):
+        for env in lo_envs:
+            while not env.get_action_mask().any():
+                env.reset(seed=game_count)
+                game_count += 1
+            action_mask = env.get_action_mask()
+            choice_num, tar_row, tar_col = np.unravel_index(sample_rng.choice(np.flatnonzero(action_mask)),
+                                                            action_mask.shape)
+            _, terminated, _, _, _ = env.step({"choice": choice_num, "target_position": np.array((tar_col, tar_row))})
+            if terminated:
+                env.reset(seed=game_count)
+                game_count += 1
+    env_seconds = time.time() - start_time
+    print("Single Env Steps Per Second: " + str(env_num * step_num / env_seconds))
+    print("Speedup: " + str(env_seconds / vec_seconds))
+    print("-------------------------------------------------")